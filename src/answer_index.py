@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+
+class AnswerIndex:
+    """Long-format (row, rank, code) index over a family of ranked answer columns"""
+    def __init__(self, columns: list[str], code_matrix: np.ndarray, vocabulary: pd.Index):
+        self.columns = columns
+        self.vocabulary = vocabulary
+        self.n_rows = code_matrix.shape[1]
+
+        # np.nonzero walks the (rank, row) matrix in row-major order, so entries are sorted by rank, then row
+        ranks, rows = np.nonzero(code_matrix >= 0)
+        self.rows = rows.astype(np.int32)
+        self.ranks = ranks.astype(np.int8)
+        self.codes = code_matrix[ranks, rows].astype(np.int32)
+
+    def select(self, row_mask: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Return the (codes, ranks) of answers given by the rows in row_mask, keeping entry order"""
+        if row_mask is None:
+            return self.codes, self.ranks
+        keep = row_mask[self.rows]
+        return self.codes[keep], self.ranks[keep]
+
+    def mentions(self, value) -> np.ndarray:
+        """Return a boolean row mask of respondents who gave value at any rank"""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        code = self.vocabulary.get_indexer([value])[0]
+        if code >= 0:
+            mask[self.rows[self.codes == code]] = True
+        return mask
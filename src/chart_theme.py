@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+
+from pptx.chart.chart import Chart
+from pptx.dml.color import RGBColor
+from pptx.util import Pt
+
+# Light blue used when a color cannot be resolved
+DEFAULT_COLOR = (102, 204, 255)
+
+
+def resolve_color(color: str | tuple[int, int, int] | list[int] | None) -> RGBColor | None:
+    """Return a hex string ('#66ccff'), RGBColor attribute name or RGB triple as an RGBColor; None and '' give None"""
+    if color is None or isinstance(color, (str, tuple, list)) and not color:
+        return None
+    if isinstance(color, str):
+        if color.startswith('#') and len(color) == 7:
+            return RGBColor(int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16))
+        if hasattr(RGBColor, color.upper()):
+            return getattr(RGBColor, color.upper())
+    elif isinstance(color, (tuple, list)) and len(color) == 3:
+        return RGBColor(*color)
+    print(f"Warning: Unrecognized color {color!r}, using the default")
+    return RGBColor(*DEFAULT_COLOR)
+
+
+@dataclass(frozen=True)
+class Theme:
+    """Colors, fonts and number formats shared by the chart methods, applied per series or chart"""
+    # Fill of single-series bar charts; a chart's own color argument takes precedence
+    bar_color: str | tuple[int, int, int] | None = DEFAULT_COLOR
+    # Fills of the series of multi-series bar charts, repeating; empty keeps the template's colors
+    series_colors: tuple = ()
+    # When set, replaces the font size given to each chart method
+    font_size: int | None = None
+    small_title_size: int = 12
+    small_title_font: str = 'Calibri'
+    percent_format: str = '0.0%'
+    percent_axis_format: str = '0%'
+
+    def font_pt(self, font_size: int) -> Pt:
+        return Pt(self.font_size if self.font_size is not None else font_size)
+
+    def fill_series(self, chart: Chart, color: str | tuple[int, int, int] | None = None) -> None:
+        """Fill every series of chart with color, or with series_colors in order when no color is given"""
+        colors = [color] if color is not None else list(self.series_colors)
+        for i, series in enumerate(chart.series if colors else []):
+            # One fill on the series instead of one override per data point
+            rgb = resolve_color(colors[i % len(colors)])
+            if rgb is None:
+                continue
+            series.format.fill.solid()
+            series.format.fill.fore_color.rgb = rgb
+
+    def style_small_title(self, chart: Chart) -> None:
+        title_run = chart.chart_title.text_frame.paragraphs[0].runs[0]
+        title_run.font.size = Pt(self.small_title_size)
+        title_run.font.bold = False
+        title_run.font.name = self.small_title_font
@@ -0,0 +1,145 @@
+from collections.abc import Hashable
+
+import numpy as np
+import pandas as pd
+
+
+def value_counts_order(
+    ranks: np.ndarray, codes: np.ndarray, counts: np.ndarray, first: np.ndarray, totals: np.ndarray
+) -> np.ndarray:
+    """
+    Order codes like value_counts on each column of a family (rank), merged column by column and then stably
+    sorted by total. ranks, codes, counts and first (first row position) describe the (rank, code) entries;
+    totals is indexed by code.
+    """
+    seen = np.zeros(len(totals), dtype=bool)
+    merged = []
+    for rank in np.unique(ranks):
+        entries = np.flatnonzero(ranks == rank)
+        entries = entries[np.argsort(first[entries], kind="stable")]
+        # value_counts lists values by first appearance, then sorts them with pandas' default (unstable) quicksort
+        by_count = pd.Series(counts[entries]).sort_values(ascending=False).index.to_numpy()
+        column_codes = codes[entries[by_count]]
+        merged.append(column_codes[~seen[column_codes]])
+        seen[column_codes] = True
+    order = np.concatenate(merged) if merged else np.empty(0, dtype=np.int64)
+    return order[np.argsort(-totals[order], kind="stable")]
+
+
+class CountSlice:
+    """Sparse counts of one target over the values of one dimension, as sorted (group, rank, code) keys"""
+    def __init__(self, keys: np.ndarray, counts: np.ndarray, first: np.ndarray, n_groups: int, n_ranks: int,
+                 size: int):
+        self.keys = keys
+        self.counts = counts
+        # Position of the first entry behind each key, so ties can fall back to first appearance
+        self.first = first
+        self.n_ranks = n_ranks
+        self.size = size
+        # Keys are sorted by group first, so each group is one contiguous segment
+        self.starts = np.searchsorted(keys, np.arange(n_groups + 1) * n_ranks * size)
+
+    def segment(self, group: int | None) -> slice:
+        """Return the entries of one group (the dimension code; None for every group)"""
+        if group is None:
+            return slice(0, len(self.keys))
+        return slice(self.starts[group], self.starts[group + 1])
+
+    def codes(self, entries: slice) -> np.ndarray:
+        return self.keys[entries] % self.size
+
+    def groups(self) -> np.ndarray:
+        return self.keys // (self.n_ranks * self.size)
+
+
+class CountCube:
+    """
+    Answer counts of every target (a column or a ranked answer family) broken down by each dimension column.
+    Distributions filtered by, or grouped by, a dimension are summed from the slices instead of the rows.
+    """
+    def __init__(self, dimensions: dict[str, tuple[np.ndarray, pd.Index]], n_rows: int):
+        self.n_rows = n_rows
+        # Dimension codes with NaN (-1) moved to an extra last group
+        self._groups: dict[str, np.ndarray] = {}
+        self._vocabularies: dict[str, pd.Index] = {}
+        self._group_rows: dict[str, np.ndarray] = {}
+        for name, (codes, vocabulary) in dimensions.items():
+            groups = np.where(codes >= 0, codes, len(vocabulary))
+            self._groups[name] = groups
+            self._vocabularies[name] = vocabulary
+            self._group_rows[name] = np.bincount(groups, minlength=len(vocabulary) + 1)
+        self._slices: dict[tuple[Hashable, str], CountSlice] = {}
+        self.targets: set[Hashable] = set()
+
+    @property
+    def dimensions(self) -> list[str]:
+        return list(self._groups)
+
+    def add(self, target: Hashable, rows: np.ndarray, codes: np.ndarray, ranks: np.ndarray | None,
+            size: int) -> None:
+        """Count the (row, code, rank) entries of target, given in tie-breaking order, for every dimension"""
+        n_ranks = 1 if ranks is None or len(ranks) == 0 else int(ranks.max()) + 1
+        ranks = np.zeros(len(codes), dtype=np.int64) if ranks is None else ranks.astype(np.int64)
+        codes = codes.astype(np.int64)
+        for name, groups in self._groups.items():
+            n_groups = len(self._vocabularies[name]) + 1
+            keys = (groups[rows].astype(np.int64) * n_ranks + ranks) * size + codes
+            keys, first, counts = np.unique(keys, return_index=True, return_counts=True)
+            self._slices[(target, name)] = CountSlice(keys, counts, first, n_groups, n_ranks, size)
+        self.targets.add(target)
+
+    def vocabulary(self, dimension: str) -> pd.Index:
+        return self._vocabularies[dimension]
+
+    def covers(self, target: Hashable, dimension: str | None) -> bool:
+        if target not in self.targets or not self._groups:
+            return False
+        return dimension is None or dimension in self._groups
+
+    def group(self, dimension: str | None, value) -> int | None:
+        """Return the group of dimension == value (-1 if no row can match); None means every row"""
+        if dimension is None or value is None:
+            return None
+        return int(self._vocabularies[dimension].get_indexer([value])[0])
+
+    def group_rows(self, dimension: str | None, group: int | None) -> int:
+        if group is None:
+            return self.n_rows
+        return int(self._group_rows[dimension][group]) if group >= 0 else 0
+
+    def ranked_counts(
+        self, target: Hashable, dimension: str | None, group: int | None, rank_weights: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return (codes, counts) of target within one group, largest first, ties in value_counts_order"""
+        cube_slice = self._slices[(target, dimension if dimension is not None else self.dimensions[0])]
+        if group is not None and group < 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        entries = cube_slice.segment(group)
+        size = cube_slice.size
+        # Merge the entries of different groups (group None) into one per (rank, code)
+        keys, inverse = np.unique(cube_slice.keys[entries] % (cube_slice.n_ranks * size), return_inverse=True)
+        counts = np.bincount(inverse, weights=cube_slice.counts[entries], minlength=len(keys)).astype(np.int64)
+        first = np.full(len(keys), np.iinfo(np.int64).max)
+        np.minimum.at(first, inverse, cube_slice.first[entries])
+        codes, ranks = keys % size, keys // size
+        weights = counts if rank_weights is None else counts * rank_weights[ranks]
+        totals = np.bincount(codes, weights=weights, minlength=size)
+        if rank_weights is None:
+            totals = totals.astype(np.int64)
+        order = value_counts_order(ranks, codes, counts, first, totals)
+        return order, totals[order]
+
+    def matrix(self, target: Hashable, dimension: str, groups: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return the (codes x groups) counts of target and each group's row count; unknown groups (-1) are empty"""
+        cube_slice = self._slices[(target, dimension)]
+        n_groups = len(self._vocabularies[dimension]) + 1
+        size = cube_slice.size
+        counts = np.bincount(
+            cube_slice.groups() * size + cube_slice.codes(slice(None)),
+            weights=cube_slice.counts, minlength=n_groups * size,
+        ).astype(np.int64).reshape(n_groups, size)
+        # A last all-zero group stands in for groups that match no row
+        counts = np.vstack([counts, np.zeros((1, size), dtype=np.int64)])
+        group_rows = np.append(self._group_rows[dimension], 0)
+        groups = np.where(groups >= 0, groups, n_groups)
+        return counts[groups].T, group_rows[groups]
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Under the project root rather than the working directory, so every entry point shares one cache
+CACHE_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+DATA_CACHE_DIR = os.path.join(CACHE_ROOT, "data")
+
+
+class DataCache:
+    """Persistent Parquet cache of cleaned survey data, keyed by workbook content hash"""
+    MANIFEST_FILE = "manifest.json"
+    DATA_FILE = "data.parquet"
+    # Bump when the on-disk layout changes
+    FORMAT_VERSION = 2
+    # Every upload is a new workbook, so only the most recently used entries are kept
+    MAX_ENTRIES = 16
+
+    def __init__(self, cache_dir: str, schema_version: int | str, max_entries: int = MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.schema_version = schema_version
+        self.max_entries = max_entries
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        """Return the SHA-256 hex digest of the file contents"""
+        sha = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                sha.update(block)
+        return sha.hexdigest()
+
+    @staticmethod
+    def entry_key(file_hash: str, columns: frozenset[str] | None = None) -> str:
+        """Return the cache key of a workbook, optionally projected onto a set of columns"""
+        if columns is None:
+            return file_hash
+        sha = hashlib.sha256(file_hash.encode())
+        for name in sorted(columns):
+            sha.update(b"\0" + name.encode("utf-8"))
+        return sha.hexdigest()
+
+    def load(self, key: str) -> pd.DataFrame | None:
+        """Return the cached frame for key, or None on a miss or stale entry"""
+        manifest = self._manifest(key)
+        if manifest is None:
+            return None
+        entry_dir = os.path.join(self.cache_dir, key)
+
+        try:
+            table = pd.read_parquet(os.path.join(entry_dir, self.DATA_FILE))
+        except Exception:
+            return None
+        self._touch(entry_dir)
+
+        columns = {}
+        for i, meta in enumerate(manifest["columns"]):
+            values = table[f"c{i}"]
+            if meta.get("categorical"):
+                dtype = pd.CategoricalDtype(pd.Index(meta["vocabulary"], dtype=object))
+                values = pd.Series(pd.Categorical.from_codes(values.to_numpy(), dtype=dtype))
+            elif meta["vocabulary"] is not None:
+                # Object columns are stored as codes; -1 picks the trailing NaN slot
+                vocabulary = np.empty(len(meta["vocabulary"]) + 1, dtype=object)
+                vocabulary[:-1] = meta["vocabulary"]
+                vocabulary[-1] = np.nan
+                values = pd.Series(vocabulary[values.to_numpy()], dtype=object)
+            columns[meta["name"]] = values
+
+        return pd.DataFrame(columns)
+
+    def load_metadata(self, key: str) -> dict | None:
+        """Return the metadata stored alongside the cached frame for key, or None on a miss"""
+        manifest = self._manifest(key)
+        return manifest.get("metadata") if manifest is not None else None
+
+    def _manifest(self, key: str) -> dict | None:
+        try:
+            with open(os.path.join(self.cache_dir, key, self.MANIFEST_FILE), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (manifest.get("format_version") != self.FORMAT_VERSION
+                or manifest.get("schema_version") != self.schema_version
+                or manifest.get("key") != key):
+            return None
+        return manifest
+
+    def store(self, key: str, df: pd.DataFrame, metadata: dict | None = None) -> bool:
+        """Write df and JSON-serialisable metadata to the cache under key, returning False if it cannot be cached"""
+        table = {}
+        columns = []
+        for i, name in enumerate(df.columns):
+            series = df[name]
+            vocabulary = None
+            categorical = isinstance(series.dtype, pd.CategoricalDtype)
+            if categorical or series.dtype == object:
+                if categorical:
+                    codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+                else:
+                    codes, uniques = pd.factorize(series)
+                vocabulary = [_to_json_scalar(value) for value in uniques]
+                if any(value is _UNSUPPORTED for value in vocabulary):
+                    print(f"Column {name} contains values that cannot be cached.")
+                    return False
+                series = pd.Series(codes.astype(np.int32))
+            table[f"c{i}"] = series.reset_index(drop=True)
+            columns.append({"name": _to_json_scalar(name), "vocabulary": vocabulary, "categorical": categorical})
+
+        if any(meta["name"] is _UNSUPPORTED for meta in columns):
+            return False
+
+        manifest = {
+            "format_version": self.FORMAT_VERSION,
+            "schema_version": self.schema_version,
+            "key": key,
+            "rows": len(df),
+            "columns": columns,
+            "metadata": metadata,
+        }
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry_dir = os.path.join(self.cache_dir, key)
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir)
+        try:
+            pd.DataFrame(table).to_parquet(os.path.join(tmp_dir, self.DATA_FILE), index=False)
+            # Manifest goes in last so a half-written entry is never read as a hit
+            with open(os.path.join(tmp_dir, self.MANIFEST_FILE), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        self._evict()
+        return True
+
+    @staticmethod
+    def _touch(entry_dir: str) -> None:
+        """Mark an entry as just used; its modification time orders the eviction"""
+        try:
+            os.utime(entry_dir)
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries beyond max_entries"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, name)
+            # Only finished entries have a manifest; temporary directories of concurrent writers are left alone
+            if os.path.isfile(os.path.join(entry_dir, self.MANIFEST_FILE)):
+                try:
+                    entries.append((os.path.getmtime(entry_dir), entry_dir))
+                except OSError:
+                    continue
+        entries.sort(reverse=True)
+        for _, entry_dir in entries[self.max_entries:]:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+
+
+_UNSUPPORTED = object()
+
+
+def _to_json_scalar(value):
+    """Convert a cell value to a JSON scalar that round-trips to the same Python value"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (str, bool, int, float)):
+        return value
+    return _UNSUPPORTED
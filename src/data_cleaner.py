@@ -0,0 +1,103 @@
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Bump whenever the cleaning rules below change so cached frames are rebuilt
+CLEANING_VERSION = 1
+
+SENTINEL = 999
+
+
+@dataclass
+class ColumnCleaningStats:
+    """Changes made to a single column by DataCleaner"""
+    column: str
+    seconds: float
+    stripped: int = 0
+    emptied: int = 0
+    sentinels: int = 0
+
+
+class DataCleaner:
+    """Column-wise cleaning stage: trims strings, turns blanks and the 999 sentinel into NaN"""
+    def __init__(self, sentinel: int = SENTINEL):
+        self.sentinel = sentinel
+        self.stats: list[ColumnCleaningStats] = []
+
+    def clean(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return a cleaned copy of df, recording per-column stats in self.stats"""
+        self.stats = []
+        columns = {}
+        for name in df.columns:
+            start = time.perf_counter()
+            stats = ColumnCleaningStats(column=name, seconds=0.0)
+            columns[name] = self._clean_column(df[name], stats)
+            stats.seconds = time.perf_counter() - start
+            self.stats.append(stats)
+
+        return pd.DataFrame(columns, index=df.index)
+
+    def clean_distinct(self, name: str, values: pd.Series, counts: np.ndarray) -> pd.Series:
+        """Clean the distinct values of a dictionary-encoded column; counts[i] cells hold values[i]"""
+        start = time.perf_counter()
+        stats = ColumnCleaningStats(column=name, seconds=0.0)
+        cleaned = self._clean_column(values, stats, counts)
+        stats.seconds = time.perf_counter() - start
+        self.stats.append(stats)
+        return cleaned
+
+    def stats_frame(self) -> pd.DataFrame:
+        """Return the stats of the last clean() call as a DataFrame"""
+        return pd.DataFrame([vars(s) for s in self.stats], columns=[
+            "column", "seconds", "stripped", "emptied", "sentinels"
+        ])
+
+    def _clean_column(
+        self, series: pd.Series, stats: ColumnCleaningStats, weights: np.ndarray | None = None
+    ) -> pd.Series:
+        # weights gives the number of cells each entry stands for when series holds distinct values
+        if series.dtype == object:
+            return self._clean_object_column(series, stats, weights)
+
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            sentinel_mask = series.to_numpy() == self.sentinel
+            stats.sentinels = int(sentinel_mask.sum() if weights is None else weights[sentinel_mask].sum())
+            if stats.sentinels:
+                return series.mask(sentinel_mask)
+
+        return series
+
+    def _clean_object_column(
+        self, series: pd.Series, stats: ColumnCleaningStats, weights: np.ndarray | None = None
+    ) -> pd.Series:
+        # Survey answers repeat heavily, so the string work is done once per distinct value
+        codes, uniques = pd.factorize(series)
+        uniques = np.asarray(uniques, dtype=object)
+        valid = codes >= 0
+        counts = np.bincount(
+            codes[valid], weights=None if weights is None else weights[valid], minlength=len(uniques)
+        )
+
+        # .str.strip() yields NaN for anything that is not a string, which doubles as the string mask
+        trimmed = pd.Series(uniques, dtype=object).str.strip()
+        is_str = trimmed.notna().to_numpy()
+        trimmed = trimmed.to_numpy()
+
+        empty = is_str & (trimmed == "")
+        sentinel = np.where(is_str, trimmed == str(self.sentinel), uniques == self.sentinel)
+        stats.stripped = int(counts[is_str & (trimmed != uniques)].sum())
+        stats.emptied = int(counts[empty].sum())
+        stats.sentinels = int(counts[sentinel].sum())
+
+        replacement = np.where(is_str, trimmed, uniques)
+        replacement[empty | sentinel] = np.nan
+
+        # Only string and dropped cells are rewritten; other objects are kept as they were read
+        rewrite = np.append(is_str | empty | sentinel, False)[codes]
+        values = series.to_numpy(dtype=object, copy=True)
+        values[rewrite] = np.append(replacement, np.nan)[codes[rewrite]]
+
+        # Match the dtype inference a cell-wise map would have applied
+        return pd.Series(values, index=series.index, name=series.name, dtype=object).infer_objects()
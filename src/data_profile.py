@@ -0,0 +1,101 @@
+from dataclasses import asdict, dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class ColumnProfile:
+    """Summary of a single column: missing values, distinct values and the most common ones"""
+    column: str
+    dtype: str
+    rows: int
+    nulls: int
+    cardinality: int
+    sentinels: int
+    # [value, count] pairs, most common first
+    top_values: list
+    # Every distinct value and its count, kept for columns with few distinct values
+    values: list | None = None
+    counts: list | None = None
+
+    @property
+    def null_rate(self) -> float:
+        return self.nulls / self.rows if self.rows else 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnProfile":
+        return cls(**data)
+
+
+class DataProfiler:
+    """Builds column profiles from dictionary-encoded columns with one count per column"""
+    def __init__(self, top_k: int = 5, max_values: int = 1000):
+        self.top_k = top_k
+        self.max_values = max_values
+
+    def profile_column(
+        self, column: str, dtype, codes: np.ndarray, vocabulary: pd.Index, sentinels: int = 0
+    ) -> ColumnProfile:
+        """Profile one column given its codes (-1 for NaN) into vocabulary"""
+        valid = codes[codes >= 0]
+        counts = np.bincount(valid, minlength=len(vocabulary))
+        # Categorical vocabularies may hold values that do not occur in this column
+        present = np.flatnonzero(counts)
+        # Most common first, ties in vocabulary order
+        order = present[np.lexsort((present, -counts[present]))]
+
+        raw_values = vocabulary.take(order).tolist()
+        values = [_json_value(value) for value in raw_values]
+        # Top values are for display, so anything JSON cannot hold is shown as text
+        top_values = [
+            [value if value is not _UNSUPPORTED else str(raw), count]
+            for value, raw, count in zip(values, raw_values, counts[order[:self.top_k]].tolist())
+        ]
+        keep_values = len(order) <= self.max_values and all(value is not _UNSUPPORTED for value in values)
+
+        return ColumnProfile(
+            column=column,
+            dtype=str(dtype),
+            rows=len(codes),
+            nulls=len(codes) - len(valid),
+            cardinality=len(order),
+            sentinels=sentinels,
+            top_values=top_values,
+            values=values if keep_values else None,
+            counts=counts[order].tolist() if keep_values else None,
+        )
+
+
+def profile_frame(profiles: list[ColumnProfile]) -> pd.DataFrame:
+    """Return profiles as a DataFrame with one row per column"""
+    return pd.DataFrame(
+        [
+            {
+                "column": p.column,
+                "dtype": p.dtype,
+                "null_rate": p.null_rate,
+                "nulls": p.nulls,
+                "cardinality": p.cardinality,
+                "sentinels": p.sentinels,
+                "top_values": ", ".join(f"{value} ({count})" for value, count in p.top_values),
+            }
+            for p in profiles
+        ],
+        columns=["column", "dtype", "null_rate", "nulls", "cardinality", "sentinels", "top_values"],
+    )
+
+
+_UNSUPPORTED = object()
+
+
+def _json_value(value):
+    """Return value if it can be stored as JSON unchanged, else _UNSUPPORTED"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (str, bool, int, float)):
+        return value
+    return _UNSUPPORTED
@@ -1,35 +1,405 @@
+from collections.abc import Callable, Iterable
+
 import pandas as pd
 import numpy as np
-import yaml
+from pandas.io.parsers import TextParser
+
+from data_cache import DataCache
+from data_cleaner import CLEANING_VERSION, ColumnCleaningStats, DataCleaner
+from data_profile import ColumnProfile, DataProfiler, profile_frame
+from answer_index import AnswerIndex
+from count_cube import CountCube, value_counts_order
+from filter_index import FilterIndex
+from query_cache import QueryCache
+from survey_schema import SCHEMA, SurveySchema
+from data_validator import DataValidator
+from distribution_result import DistributionResult
+from validation_result import ValidationResult
+from workbook_reader import WorkbookReader
+
+
+# Object columns with at most this share of distinct values are stored as categoricals
+CATEGORY_MAX_RATIO = 0.5
+
 
 class DataReader:
     """Class to read data from an Excel file"""
-    def __init__(self, file_path: str):
+    def __init__(
+        self,
+        file_path: str,
+        cache_dir: str | None = None,
+        query_cache_size: int = 256,
+        columns: Iterable[str] | None = None,
+        streaming: bool = False,
+        chunk_size: int = 10_000,
+        on_progress: Callable[[int, int | None], None] | None = None,
+        value_rules: list[tuple[str | list[str], list]] | None = None,
+        schema: SurveySchema = SCHEMA,
+        count_cube: bool = False,
+    ):
         self.file_path = file_path
-        
-        try:
-            df = pd.read_excel(self.file_path)
-
-            df = df.map(lambda x: x.strip() if isinstance(x, str) else x)
-            df = df.map(lambda x: np.nan if isinstance(x, str) and x.strip() == "" else x)
-            df = df.replace([999, "999"], np.nan)
+        # Declares the column groups and answer families that share category vocabularies
+        self.schema = schema
+        # Cached frames are rebuilt when either the cleaning rules or the schema change
+        self.cache = DataCache(cache_dir, f"{CLEANING_VERSION}:{schema.digest}") if cache_dir else None
+        # When set, only these columns are read from the workbook
+        self.columns = frozenset(columns) if columns is not None else None
+        # Streaming reads the sheet row by row in chunks of chunk_size, reporting progress to on_progress
+        self.streaming = streaming
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.cleaning_stats: list[ColumnCleaningStats] = []
+        # Column profiles are computed with the data and cached alongside it
+        self.profiler = DataProfiler()
+        self.profiles: dict[str, ColumnProfile] = {}
+        self.data = self._load()
+        self.missing_columns = sorted(self.columns - set(self.data.columns)) if self.columns else []
+        if self.missing_columns:
+            print(f"Missing columns in {self.file_path}: {', '.join(self.missing_columns)}")
+        # Value rules are checked once at load time, on the encoded columns, and again after replacements
+        self.value_rules = value_rules
+        self.value_results = self._check_values(value_rules) if value_rules is not None else None
+        self.filter_index = FilterIndex(self.data)
+        self.query_cache = QueryCache(query_cache_size)
+        self._answer_indexes: dict[tuple[str, ...], AnswerIndex] = {}
+        # Counts of every column and answer family per value of the schema's cube dimensions
+        self.count_cube = self._build_count_cube() if count_cube else None
+
+    def _load(self) -> pd.DataFrame:
+        cache_key = None
+        if self.cache is not None:
+            try:
+                cache_key = DataCache.entry_key(DataCache.hash_file(self.file_path), self.columns)
+                df = self.cache.load(cache_key)
+            except OSError:
+                df = None
+            if df is not None:
+                print(f"Data loaded from cache for {self.file_path}")
+                metadata = self.cache.load_metadata(cache_key) or {}
+                if "profiles" in metadata:
+                    self.profiles = {p["column"]: ColumnProfile.from_dict(p) for p in metadata["profiles"]}
+                else:
+                    self.profiles = self._build_profiles(df)
+                return df
 
-            self.data = df
+        try:
+            if self.streaming:
+                df = self._read_streaming()
+            else:
+                if self.columns is None:
+                    df = pd.read_excel(self.file_path)
+                else:
+                    df = WorkbookReader(self.file_path, self.columns).read_frame()
+
+                cleaner = DataCleaner(self.schema.sentinel)
+                df = self._encode_categories(cleaner.clean(df))
+                self.cleaning_stats = cleaner.stats
             print(f"Data read successfully from {self.file_path}")
 
         except Exception as e:
             raise ValueError("Failed to read data from Excel file.")
 
-    def replace_invalid_values(self, validate_results: list[dict]) -> None:
-        """Replace invalid values in the data with NaN"""
-        for result_dict in validate_results:
-            for column, invalid_entries in result_dict.items():
-                if column == "acceptable_values":
-                    continue
+        self.profiles = self._build_profiles(df)
+        if cache_key is not None:
+            try:
+                metadata = {"profiles": [profile.to_dict() for profile in self.profiles.values()]}
+                self.cache.store(cache_key, df, metadata)
+            except Exception as e:
+                print(f"Failed to write data cache: {e}")
+
+        return df
+
+    def _read_streaming(self) -> pd.DataFrame:
+        """Stream the workbook into dictionary-encoded columns, typing and cleaning each distinct value once"""
+        reader = WorkbookReader(self.file_path, self.columns, self.chunk_size, self.on_progress)
+        names, encoded = reader.read_encoded()
+
+        cleaner = DataCleaner(self.schema.sentinel)
+        columns = {}
+        for name, (codes, values) in zip(names, encoded):
+            if not values:
+                columns[name] = np.empty(0, dtype=object)
+                continue
+            # Type inference only depends on which values occur, so pandas parses the distinct values alone
+            distinct = TextParser([[v] for v in values], header=None, skip_blank_lines=False).read()[0]
+            cleaned = cleaner.clean_distinct(name, distinct, np.bincount(codes, minlength=len(values)))
+            if cleaned.dtype == object:
+                cleaned_codes, categories = pd.factorize(cleaned)
+                columns[name] = pd.Categorical.from_codes(
+                    cleaned_codes[codes], categories=pd.Index(categories, dtype=object)
+                )
+            else:
+                columns[name] = cleaned.to_numpy()[codes]
+
+        self.cleaning_stats = cleaner.stats
+        return self._encode_categories(pd.DataFrame(columns))
+
+    def _encode_categories(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Store declared and low-cardinality object columns as categoricals, sharing vocabularies within a group"""
+        max_unique = max(1, int(len(df) * CATEGORY_MAX_RATIO))
+        # Streamed frames arrive with text columns already categorical
+        text = [
+            col for col in df.columns
+            if df[col].dtype == object or isinstance(df[col].dtype, pd.CategoricalDtype)
+        ]
+        declared = self.schema.categorical_columns
+        candidates = [col for col in text if col in declared or df[col].nunique() <= max_unique]
+
+        schema_groups = list(self.schema.groups.values()) + list(self.schema.families.values())
+        groups = [[col for col in cols if col in candidates] for cols in schema_groups]
+        grouped = {col for cols in groups for col in cols}
+        groups.extend([col] for col in candidates if col not in grouped)
+
+        df = df.copy()
+        for cols in groups:
+            if not cols:
+                continue
+            # Vocabulary in order of first appearance, scanning the group column by column
+            vocabulary = pd.unique(pd.concat([df[col] for col in cols], ignore_index=True).dropna())
+            dtype = pd.CategoricalDtype(pd.Index(vocabulary, dtype=object))
+            for col in cols:
+                if isinstance(df[col].dtype, pd.CategoricalDtype):
+                    # astype() keeps the old code order when the category sets match
+                    df[col] = df[col].cat.set_categories(dtype.categories)
+                else:
+                    df[col] = df[col].astype(dtype)
+        for col in set(text) - set(candidates):
+            df[col] = df[col].astype(object)
+        return df
+
+    def _check_values(self, value_rules: list[tuple[str | list[str], list]]) -> list[ValidationResult]:
+        """Apply value rules to the encoded columns: one lookup per distinct value, one gather per column"""
+        results = []
+        for column, acceptable_values in value_rules:
+            # Missing columns are reported separately through missing_columns
+            present = [col for col in ([column] if isinstance(column, str) else column) if col in self.data.columns]
+            results.append(DataValidator.check_rule(
+                present, acceptable_values, self._codes, self.data.index, self.profiles, self.schema.sentinel
+            ))
+        return results
+
+    def replace_invalid_values(
+        self, invalid: list[ValidationResult] | dict[str, np.ndarray]
+    ) -> dict[str, int]:
+        """
+        Replace invalid values in the data with NaN. invalid is either validation results or a
+        column -> boolean row mask mapping. Cells that are already NaN are left alone, so repeating
+        the call changes nothing. Returns the number of cells replaced per column. The given results are left
+        as they are; value_results is checked again on the replaced data.
+        """
+        masks = invalid if isinstance(invalid, dict) else self.invalid_masks(invalid)
+
+        blocks: dict[object, list[str]] = {}
+        for column in masks:
+            if column in self.data.columns:
+                dtype = self.data[column].dtype
+                # Categoricals are updated through their codes, one column at a time
+                key = column if isinstance(dtype, pd.CategoricalDtype) else dtype
+                blocks.setdefault(key, []).append(column)
+
+        counts = {}
+        replaced = {}
+        for columns in blocks.values():
+            series = self.data[columns[0]]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                codes = series.cat.codes.to_numpy()
+                hit = masks[columns[0]] & (codes >= 0)
+                counts[columns[0]] = int(hit.sum())
+                if counts[columns[0]]:
+                    codes = codes.copy()
+                    codes[hit] = -1
+                    replaced[columns[0]] = pd.Categorical.from_codes(codes, dtype=series.dtype)
+                continue
+
+            # One masked copy per block of same-typed columns
+            block = self.data[columns]
+            hit = np.column_stack([masks[column] for column in columns]) & block.notna().to_numpy()
+            block_counts = hit.sum(axis=0)
+            if block_counts.any():
+                masked = block.mask(hit)
+            for column, count in zip(columns, block_counts.tolist()):
+                counts[column] = count
+                if count:
+                    replaced[column] = masked[column]
+
+        for column, values in replaced.items():
+            self.data[column] = values
+        reencoded = self._drop_unused_categories(list(replaced))
+        self._invalidate(list(replaced) + [col for col in reencoded if col not in replaced])
+        if replaced and self.value_rules is not None:
+            self.value_results = self._check_values(self.value_rules)
+        return counts
+
+    def _drop_unused_categories(self, columns: list[str]) -> list[str]:
+        """
+        Remove categories no row uses any more from the given categorical columns, so replaced labels do not
+        linger as empty groups. Columns of the column's schema groups and families keep sharing one vocabulary.
+        Returns every column re-encoded.
+        """
+        schema_groups = list(self.schema.groups.values()) + list(self.schema.families.values())
+        reencoded = []
+        for column in columns:
+            if not isinstance(self.data[column].dtype, pd.CategoricalDtype) or column in reencoded:
+                continue
+            categories = self.data[column].dtype.categories
+            # The vocabularies shared at encoding time; a group member encoded on its own keeps its categories
+            members = {col for cols in schema_groups if column in cols for col in cols} | {column}
+            shared = [
+                col for col in self.data.columns
+                if col in members and isinstance(self.data[col].dtype, pd.CategoricalDtype)
+                and self.data[col].dtype.categories.equals(categories)
+            ]
+            used = np.zeros(len(categories), dtype=bool)
+            for col in shared:
+                codes = self.data[col].cat.codes.to_numpy()
+                used[codes[codes >= 0]] = True
+            if used.all():
+                continue
+            for col in shared:
+                self.data[col] = self.data[col].cat.remove_categories(categories[~used])
+            reencoded.extend(shared)
+        return reencoded
+
+    @staticmethod
+    def invalid_masks(validate_results: list[ValidationResult]) -> dict[str, np.ndarray]:
+        """Combine validation results into one boolean row mask of invalid cells per column"""
+        masks = {}
+        for result in validate_results:
+            for column, violations in result.items():
+                if column in masks:
+                    masks[column] |= violations.mask()
+                else:
+                    masks[column] = violations.mask()
+        return masks
+
+    def profile(self) -> pd.DataFrame:
+        """Return the null rate, cardinality, top values, sentinel count and dtype of every column"""
+        return profile_frame(list(self.profiles.values()))
+
+    def _build_profiles(self, df: pd.DataFrame, columns: list[str] | None = None) -> dict[str, ColumnProfile]:
+        """Profile the given columns (all by default) from their codes, taking sentinel counts from cleaning"""
+        sentinels = {stats.column: stats.sentinels for stats in self.cleaning_stats}
+        for column, profile in self.profiles.items():
+            # Cleaning stats are not kept on a cache hit, but the cached profiles carry the counts
+            sentinels.setdefault(column, profile.sentinels)
+        profiles = {}
+        for column in df.columns if columns is None else columns:
+            codes, vocabulary = self._series_codes(df[column])
+            profiles[column] = self.profiler.profile_column(
+                column, df[column].dtype, codes, vocabulary, sentinels.get(column, 0)
+            )
+        return profiles
+
+    def _invalidate(self, columns: list[str]) -> None:
+        """Forget indexes and cached query results derived from columns that were modified"""
+        self.profiles.update(self._build_profiles(self.data, columns))
+        self.filter_index.invalidate(columns)
+        self.query_cache.invalidate(columns)
+        for key in [key for key in self._answer_indexes if set(key) & set(columns)]:
+            del self._answer_indexes[key]
+        if self.count_cube is not None:
+            self.count_cube = self._build_count_cube()
+
+    def _build_count_cube(self) -> CountCube:
+        """Count every column and answer family once per value of each categorical cube dimension"""
+        dimensions = {
+            col: self._codes(col) for col in self.schema.cube_dimensions
+            if col in self.data.columns and isinstance(self.data[col].dtype, pd.CategoricalDtype)
+        }
+        cube = CountCube(dimensions, len(self.data))
+        for col in self.data.columns:
+            codes, vocabulary = self._codes(col)
+            rows = np.flatnonzero(codes >= 0)
+            cube.add(col, rows, codes[rows], None, len(vocabulary))
+        for columns in self.schema.families.values():
+            present = [col for col in columns if col in self.data.columns]
+            if present:
+                answers = self._answers(present)
+                cube.add(tuple(present), answers.rows, answers.codes, answers.ranks, len(answers.vocabulary))
+        return cube
+
+    def _cube_covers(self, target, dimension) -> bool:
+        """Whether the count cube can answer a query on target filtered or grouped by dimension"""
+        if self.count_cube is None or not (dimension is None or isinstance(dimension, str)):
+            return False
+        return self.count_cube.covers(tuple(target) if isinstance(target, list) else target, dimension)
+
+    def _codes(self, column: str) -> tuple[np.ndarray, pd.Index]:
+        """Return the integer codes (-1 for NaN) and vocabulary of a column"""
+        return self._series_codes(self.data[column])
+
+    @staticmethod
+    def _series_codes(series: pd.Series) -> tuple[np.ndarray, pd.Index]:
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series.cat.codes.to_numpy(), series.cat.categories
+        codes, uniques = pd.factorize(series)
+        return codes, pd.Index(uniques)
+
+    def _shared_codes(self, columns: list[str]) -> tuple[np.ndarray, pd.Index]:
+        """Return a (columns x rows) code matrix of several columns over one common vocabulary"""
+        encoded = [self._codes(col) for col in columns]
+        vocabulary = encoded[0][1]
+        if all(vocab.equals(vocabulary) for _, vocab in encoded):
+            return np.vstack([codes for codes, _ in encoded]), vocabulary
+
+        vocabulary = pd.Index(pd.unique(np.concatenate([vocab.to_numpy(dtype=object) for _, vocab in encoded])))
+        remapped = []
+        for codes, vocab in encoded:
+            # Map each column's own codes onto the union vocabulary; -1 stays -1
+            lookup = np.append(vocabulary.get_indexer(vocab), -1)
+            remapped.append(lookup[codes])
+        return np.vstack(remapped), vocabulary
+
+    def _answers(self, columns: list[str]) -> AnswerIndex:
+        """Return the long-format answer index of a column family, building it on first use"""
+        key = tuple(columns)
+        if key not in self._answer_indexes:
+            codes, vocabulary = self._shared_codes(columns)
+            self._answer_indexes[key] = AnswerIndex(columns, codes, vocabulary)
+        return self._answer_indexes[key]
+
+    def _filter_rows(self, filter_column: str | list[str] | None, filter_value) -> np.ndarray | None:
+        """Return a boolean row mask for filter_column == filter_value (any rank of a list of columns)"""
+        if filter_column is None or filter_value is None:
+            return None
+        if isinstance(filter_column, list):
+            return self._answers(filter_column).mentions(filter_value)
+        return self.filter_index.mask(filter_column, filter_value)
+
+    @staticmethod
+    def _ranked_counts(
+        codes: np.ndarray, size: int, ranks: np.ndarray | None = None, rank_weights: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Count non-negative codes, given at ranks (columns of a family) in row order within each rank, and return
+        (codes, counts) largest first, ties in value_counts_order
+        """
+        valid = codes >= 0
+        codes = codes[valid].astype(np.int64)
+        ranks = np.zeros(len(codes), dtype=np.int64) if ranks is None else ranks[valid].astype(np.int64)
+        keys, first, counts = np.unique(ranks * size + codes, return_index=True, return_counts=True)
+        key_ranks, key_codes = keys // size, keys % size
+        weights = counts if rank_weights is None else counts * rank_weights[key_ranks]
+        totals = np.bincount(key_codes, weights=weights, minlength=size)
+        if rank_weights is None:
+            totals = totals.astype(np.int64)
+        order = value_counts_order(key_ranks, key_codes, counts, first, totals)
+        return order, totals[order]
+
+    @staticmethod
+    def _format_key(key) -> str:
+        return str(float(key)) if isinstance(key, int) else str(key)
+
+    def _cached_query(self, key: tuple, columns: list, compute):
+        """Run compute through the query cache; key must only hold hashable arguments"""
+        used = []
+        for col in columns:
+            used.extend(col if isinstance(col, list) else [col])
+        return self.query_cache.get_or_compute(key, [col for col in used if col is not None], compute)
 
-                if column in self.data.columns and invalid_entries:
-                    row_ids = [row_id for row_id, _ in invalid_entries]
-                    self.data.loc[row_ids, column] = np.nan
+    @staticmethod
+    def _freeze(value):
+        return tuple(value) if isinstance(value, list) else value
 
     def get_col_distribution(
         self, 
@@ -41,36 +411,80 @@ class DataReader:
         return_dict: bool = False
     ) -> pd.DataFrame | dict:
         """Get the distribution of a specified column"""
-        data = self.data
+        result = self._cached_col_distribution(column_name, filter_column, filter_value, normalize, exclude)
+        if result is None:
+            return {}
 
-        if filter_column is not None and filter_value is not None:
-            if filter_column is not None and isinstance(filter_column, str):
-                data = data[data[filter_column] == filter_value]
-            elif isinstance(filter_column, list):
-                # Apply OR condition: any of the filter_columns can have the filter_value
-                mask = data[filter_column].eq(filter_value).any(axis=1)
-                data = data[mask]
+        if return_dict:
+            return result.to_dict()
 
-        if len(data) == 0:
+        return result.to_frame(column_name)
+
+    def col_distribution(
+        self,
+        column_name: str,
+        filter_column: str | list[str] | None = None,
+        filter_value: str | int | None = None,
+        normalize: bool = True,
+        exclude: float | int | None = None,
+    ) -> DistributionResult:
+        """Get the distribution of a specified column as a DistributionResult, largest first"""
+        result = self._cached_col_distribution(column_name, filter_column, filter_value, normalize, exclude)
+        return result if result is not None else DistributionResult.empty()
+
+    def _cached_col_distribution(
+        self, column_name, filter_column, filter_value, normalize, exclude
+    ) -> DistributionResult | None:
+        return self._cached_query(
+            ("col", column_name, self._freeze(filter_column), filter_value, normalize, exclude),
+            [column_name, filter_column],
+            lambda: self._col_distribution(column_name, filter_column, filter_value, normalize, exclude),
+        )
+
+    def _col_distribution(
+        self, column_name, filter_column, filter_value, normalize, exclude
+    ) -> DistributionResult | None:
+        if self._cube_covers(column_name, filter_column):
+            return self._cube_col_distribution(column_name, filter_column, filter_value, normalize, exclude)
+
+        rows = self._filter_rows(filter_column, filter_value)
+
+        if rows is not None and not rows.any():
             raise ValueError(f"No rows found after filtering for column {filter_column} == {filter_value}")
 
-        if exclude is not None:
-            data = data[data[column_name] != exclude]
-        
-        if column_name not in data.columns:
+        if column_name not in self.data.columns:
             print(f"Column {column_name} does not exist in the data.")
-            return {}
+            return None
 
-        data = data.dropna(subset=[column_name])
+        codes, vocabulary = self._codes(column_name)
+        if rows is not None:
+            codes = codes[rows]
 
-        distribution = data[column_name].value_counts(normalize=normalize).to_dict()
-        distribution = {str(float(k)) if isinstance(k, int) else str(k): v for k, v in distribution.items()}
+        if exclude is not None:
+            excluded = np.append(np.asarray(vocabulary == exclude, dtype=bool), False)
+            codes = codes[~excluded[codes]]
+
+        keys, counts = self._ranked_counts(codes, len(vocabulary))
+        values = counts / counts.sum() if normalize else counts
+        labels = np.array([self._format_key(k) for k in vocabulary[keys].tolist()], dtype=object)
+        return DistributionResult(labels, values)
+
+    def _cube_col_distribution(
+        self, column_name, filter_column, filter_value, normalize, exclude
+    ) -> DistributionResult:
+        group = self.count_cube.group(filter_column, filter_value)
+        if self.count_cube.group_rows(filter_column, group) == 0:
+            raise ValueError(f"No rows found after filtering for column {filter_column} == {filter_value}")
 
-        if return_dict:
-            return distribution
+        _, vocabulary = self._codes(column_name)
+        keys, counts = self.count_cube.ranked_counts(column_name, filter_column, group)
+        if exclude is not None:
+            kept = ~np.asarray(vocabulary[keys] == exclude, dtype=bool)
+            keys, counts = keys[kept], counts[kept]
 
-        return pd.DataFrame(distribution.items(), columns=[column_name, 'distribution'])
-        
+        values = counts / counts.sum() if normalize else counts
+        labels = np.array([self._format_key(k) for k in vocabulary[keys].tolist()], dtype=object)
+        return DistributionResult(labels, values)
 
     def get_binary_distribution(
         self, 
@@ -81,39 +495,138 @@ class DataReader:
         filter_value: str | int | None = None,
         return_dict: bool = True
     ) -> dict[str, float] | pd.DataFrame:
-        result = {}
-        data = self.data
-        if filter_column is not None and filter_value is not None:
-            data = self.data[self.data[filter_column] == filter_value]
-        data = data.dropna(subset=columns)
+        result = self.binary_distribution(columns, value, unique, filter_column, filter_value)
 
-        if len(data) == 0:
-            raise ValueError(f"No rows found after filtering for column {filter_column} == {filter_value}")
+        if return_dict:
+            return result.to_dict()
 
-        # Drop rows where more than one target value exists in the specified columns
-        if unique:
-            target_mask = data[columns].apply(lambda row: (pd.to_numeric(row, errors='coerce') == value).sum(), axis=1)
-            data = data[target_mask <= 1]
-            
+        return result.to_frame('category')
+
+    def binary_distribution(
+        self,
+        columns: list[str],
+        value: int = 1,
+        unique: bool = False,
+        filter_column: str | None = None,
+        filter_value: str | int | None = None,
+    ) -> DistributionResult:
+        """Get the share of rows where each column equals value, as a DistributionResult in column order"""
+        return self._cached_query(
+            ("binary", tuple(columns), value, unique, filter_column, filter_value),
+            [columns, filter_column],
+            lambda: self._binary_distribution(columns, value, unique, filter_column, filter_value),
+        )
+
+    def _binary_distribution(self, columns, value, unique, filter_column, filter_value) -> DistributionResult:
+        shares = self._binary_matrix(columns, [value], unique, filter_column, filter_value)
+        return DistributionResult(np.array(columns, dtype=object), shares[:, 0].copy())
+
+    def get_rank_distribution(
+        self,
+        columns: list[str],
+        values: list[int],
+        unique: bool = False,
+        filter_column: str | None = None,
+        filter_value: str | int | None = None,
+    ) -> pd.DataFrame:
+        """
+        Get get_binary_distribution for every value (e.g. ranks 1..4) in one pass,
+        as a categories x values frame.
+        """
+        shares = self._cached_query(
+            ("rank", tuple(columns), tuple(values), unique, filter_column, filter_value),
+            [columns, filter_column],
+            lambda: self._binary_matrix(columns, values, unique, filter_column, filter_value),
+        )
+        return pd.DataFrame(
+            shares.copy(),
+            index=pd.Index(columns, dtype=object, name="category"),
+            columns=pd.Index(values, name="value"),
+        )
+
+    def _present_columns(self, columns: list[str]) -> list[str | None]:
+        """Return columns with the ones missing from the data replaced by None, warning about each"""
+        present = []
         for col in columns:
-            if col not in data.columns:
+            if col not in self.data.columns:
                 print(f"Warning: Column '{col}' not found in DataFrame")
-                result[col] = 0.0
+                present.append(None)
             else:
-                # Count the number of 1s in each column, handle non-numeric values as 0
-                numeric_col = pd.to_numeric(data[col], errors='coerce').fillna(0)
-                count = int((numeric_col == value).sum())
-                result[col] = count / len(data)
+                present.append(col)
+        return present
+
+    @staticmethod
+    def _numeric_values(values) -> np.ndarray:
+        # A value that is not a number matches no answer
+        return np.array(
+            [value if isinstance(value, (int, float, np.number)) else np.nan for value in values], dtype=float
+        )
+
+    def _value_hits(self, column: str, values: np.ndarray, text_as_zero: bool = False) -> np.ndarray:
+        """
+        Return a (values x rows) mask of rows whose answer in column equals each value.
+        Non-numeric answers match nothing, or match 0 with text_as_zero.
+        """
+        series = self.data[column]
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            return series.to_numpy(dtype=float, na_value=np.nan)[None, :] == values[:, None]
+        # Text columns are compared once per distinct answer, then gathered through the codes
+        codes, vocabulary = self._codes(column)
+        numeric = pd.to_numeric(pd.Series(vocabulary, dtype=object), errors='coerce').to_numpy(dtype=float)
+        if text_as_zero:
+            # Every vocabulary entry is an answer, so NaN here is text
+            numeric = np.nan_to_num(numeric, nan=0.0)
+        return (np.append(numeric, np.nan)[None, :] == values[:, None])[:, codes]
+
+    def _answered_rows(self, columns: list[str | None], rows: np.ndarray | None = None) -> np.ndarray:
+        """Return rows (all by default) narrowed to those answering every present column; non-numeric answers count"""
+        rows = np.ones(len(self.data), dtype=bool) if rows is None else rows
+        for col in columns:
+            if col is not None:
+                if pd.api.types.is_numeric_dtype(self.data[col].dtype):
+                    rows &= self.data[col].notna().to_numpy()
+                else:
+                    rows &= self._codes(col)[0] >= 0
+        return rows
+
+    def _binary_matrix(self, columns, values, unique, filter_column, filter_value) -> np.ndarray:
+        """Return the (columns x values) shares of rows where each column equals each value"""
+        present = self._present_columns(columns)
+        values = self._numeric_values(values)
+
+        rows = self._answered_rows(present, self._filter_rows(filter_column, filter_value))
+
+        if not rows.any():
+            raise ValueError(f"No rows found after filtering for column {filter_column} == {filter_value}")
 
+        # (values x rows) rows counted for each value
+        counted = np.broadcast_to(rows, (len(values), len(self.data)))
         if unique:
-            # Normalize so the sum of result is 100
-            total = sum(result.values())
-            result = {k: v / total for k, v in result.items()}
+            # Drop rows where more than one column holds the value
+            holders = np.zeros((len(values), len(self.data)), dtype=np.int32)
+            for col in present:
+                if col is not None:
+                    holders += self._value_hits(col, values)
+            counted = counted & (holders <= 1)
+
+        # (values x columns), one column at a time so no (values x columns x rows) cube is built;
+        # text answers are counted as 0 here, while the unique check above ignores them
+        counts = np.zeros((len(values), len(columns)), dtype=np.int64)
+        for j, col in enumerate(present):
+            if col is not None:
+                hits = self._value_hits(col, values, text_as_zero=True)
+                counts[:, j] = np.count_nonzero(hits & counted, axis=1)
+        totals = counted.sum(axis=1, keepdims=True)
+        shares = np.divide(counts, totals, out=np.zeros(counts.shape), where=totals > 0)
 
-        if return_dict:
-            return result       
+        if unique:
+            # Normalize so the shares of each value sum to 1
+            totals = shares.sum(axis=1, keepdims=True)
+            shares = np.divide(shares, totals, out=np.zeros(shares.shape), where=totals > 0)
 
-        return pd.DataFrame(result.items(), columns=['category', 'distribution'])
+        shares = shares.T
+        shares.flags.writeable = False
+        return shares
 
 
     def get_combined_distribution(
@@ -122,39 +635,316 @@ class DataReader:
         filtered_column: str | None = None,
         filter_value: str | int | None = None,
         return_dict: bool = False,
+        rank_weights: list[float] | None = None,
     ) -> pd.DataFrame| dict[str, ]:
         """
         Get the normalized combined distribution of multiple specified columns.
-        Optionally filter the data by a column and value.
+        Optionally filter the data by a column and value, and weight each
+        answer by the position of its column (e.g. [3, 2, 1] for ranked choices).
         """
-        result = {}
-
-        data = self.data
-        if filtered_column is not None and filter_value is not None:
-            data = data[data[filtered_column] == filter_value]
+        weights = self._freeze(rank_weights)
+        items = self._cached_query(
+            ("combined", tuple(columns), filtered_column, filter_value, weights),
+            [columns, filtered_column],
+            lambda: self._combined_distribution(columns, filtered_column, filter_value, weights),
+        )
 
-        if len(data) == 0:
+        if return_dict:
+            return dict(items)
+
+        return pd.DataFrame(items, columns=[columns[0], 'distribution'])
+
+    def _combined_distribution(self, columns, filtered_column, filter_value, rank_weights) -> tuple:
+        present, weights = [], []
+        for i, col in enumerate(columns):
+            if col in self.data.columns:
+                present.append(col)
+                weights.append(1.0 if rank_weights is None else rank_weights[i])
+
+        # The cube counts the answers and knows the group size, so no row mask is built
+        use_cube = self._cube_covers(present, filtered_column)
+        if use_cube:
+            group = self.count_cube.group(filtered_column, filter_value)
+            total_count = self.count_cube.group_rows(filtered_column, group)
+        else:
+            rows = self._filter_rows(filtered_column, filter_value)
+            total_count = len(self.data) if rows is None else int(rows.sum())
+
+        if total_count == 0:
             raise ValueError(f"No rows found after filtering for column {filtered_column} == {filter_value}")
 
-        total_count = len(data)
-
         for col in columns:
-            if col in data.columns:
-                distribution = data[col].value_counts().to_dict()
-                for key, value in distribution.items():
-                    result[key] = result.get(key, 0) + value
-            else:
+            if col not in self.data.columns:
                 print(f"Column {col} does not exist in the data.")
 
-        if total_count > 0:
-            # Normalize the result
-            result = {k: v / total_count for k, v in result.items()}
-            result = dict(sorted(result.items(), key=lambda item: item[1], reverse=True))
-
-        if return_dict:
-            return result
+        if not present:
+            return ()
+
+        answers = self._answers(present)
+        if use_cube:
+            keys, counts = self.count_cube.ranked_counts(
+                tuple(present), filtered_column, group, None if rank_weights is None else np.asarray(weights)
+            )
+        else:
+            codes, ranks = answers.select(rows)
+            keys, counts = self._ranked_counts(
+                codes, len(answers.vocabulary), ranks, None if rank_weights is None else np.asarray(weights)
+            )
+        return tuple(zip(answers.vocabulary[keys].tolist(), (counts / total_count).tolist()))
+
+    def get_distribution_matrix(
+        self,
+        target: str | list[str],
+        by: str | list[str],
+        groups: list | None = None,
+        by_value: int | None = 1,
+        target_value: int | None = None,
+        normalize: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Get the distribution of target for every group of by in one pass, as a categories x groups frame.
+        target is a column, a ranked answer family, or with target_value a list of binary columns.
+        by is a column (one group per value, or per value in groups), a list of binary columns
+        (rows equal to by_value), or with by_value=None a ranked answer family (rows mentioning each answer).
+        Normalized columns match get_col_distribution, get_combined_distribution and
+        get_binary_distribution filtered to that group.
+        """
+        labels, group_labels, values = self._cached_matrix(target, by, groups, by_value, target_value, normalize)
+        if isinstance(target, str):
+            index_name = target
+        else:
+            index_name = "category" if target_value is not None else target[0]
+
+        return pd.DataFrame(
+            values.copy(),
+            index=pd.Index(labels, dtype=object, name=index_name),
+            columns=pd.Index(group_labels, dtype=object, name=by if isinstance(by, str) else None),
+        )
+
+    def _cached_matrix(self, target, by, groups, by_value, target_value, normalize) -> tuple:
+        return self._cached_query(
+            ("matrix", self._freeze(target), self._freeze(by), self._freeze(groups), by_value, target_value, normalize),
+            [target, by],
+            lambda: self._distribution_matrix(target, by, groups, by_value, target_value, normalize),
+        )
+
+    def get_top_k(
+        self,
+        target: str | list[str],
+        k: int | None,
+        by: str | list[str] | None = None,
+        groups: list | None = None,
+        by_value: int | None = 1,
+        target_value: int | None = None,
+        normalize: bool = True,
+    ) -> DistributionResult | dict:
+        """
+        Get the k largest categories (all with k=None) of target for every group of by at once, as a
+        group -> DistributionResult dict (see get_distribution_matrix for target and by). With by=None, return one
+        result over all rows. Each group is ordered like get_col_distribution or get_combined_distribution filtered
+        to it, ties included; binary targets break ties by column order. Zero shares are left out.
+        """
+        ranked = self._cached_query(
+            ("top_k", self._freeze(target), k, self._freeze(by), self._freeze(groups), by_value, target_value,
+             normalize),
+            [target, by],
+            lambda: self._top_k(target, k, by, groups, by_value, target_value, normalize),
+        )
+        # A fresh dict per call so callers can change it without touching the cached one
+        return ranked[None] if by is None else dict(ranked)
+
+    def _top_k(self, target, k, by, groups, by_value, target_value, normalize) -> dict:
+        labels, group_labels, values = self._cached_matrix(target, by, groups, by_value, target_value, normalize)
+        labels = np.array(labels, dtype=object)
+        n_labels, n_groups = values.shape
+        k = n_labels if k is None else min(k, n_labels)
+        if k == 0:
+            return {group: DistributionResult.empty() for group in group_labels}
+
+        ranked = {}
+        if target_value is None:
+            row_of = {label: i for i, label in enumerate(labels.tolist())}
+            for j, (group, order) in enumerate(zip(group_labels, self._group_orders(target, by, groups, by_value))):
+                rows = np.array([row_of[label] for label in order[:k]], dtype=np.int64)
+                ranked[group] = DistributionResult(labels[rows], values[rows, j])
+            return ranked
+
+        # Partial selection finds each group's k-th largest share without sorting whole columns
+        kth = np.argpartition(-values, k - 1, axis=0)[k - 1]
+        threshold = np.maximum(values[kth, np.arange(n_groups)], np.finfo(float).tiny)
+        for j, group in enumerate(group_labels):
+            # Only the candidates at or above the threshold are ordered: largest first, ties by matrix row
+            rows = np.flatnonzero(values[:, j] >= threshold[j])
+            rows = rows[np.lexsort((rows, -values[rows, j]))][:k]
+            ranked[group] = DistributionResult(labels[rows], values[rows, j])
+        return ranked
+
+    def _group_orders(self, target, by, groups, by_value) -> list[list]:
+        """Return the labels of each group of by in the order a distribution filtered to that group lists them"""
+        if isinstance(target, str):
+            key = target
+            vocabulary = [self._format_key(value) for value in self._codes(target)[1].tolist()]
+        else:
+            key = tuple(col for col in target if col in self.data.columns)
+            vocabulary = self._answers(list(key)).vocabulary.tolist()
+
+        if (by is None or isinstance(by, str)) and self._cube_covers(key, by):
+            if by is None:
+                group_codes = [None]
+            elif groups is None:
+                group_codes = range(len(self.count_cube.vocabulary(by)))
+            else:
+                group_codes = self.count_cube.vocabulary(by).get_indexer(pd.Index(groups, dtype=object)).tolist()
+            return [[vocabulary[code] for code in self.count_cube.ranked_counts(key, by, group)[0]] for group in group_codes]
+
+        membership, _ = self._group_membership(by, groups, by_value)
+        if isinstance(target, str):
+            codes = self._codes(target)[0]
+            rows = np.flatnonzero(codes >= 0)
+            codes, ranks = codes[rows], np.zeros(len(rows), dtype=np.int64)
+        else:
+            answers = self._answers(list(key))
+            rows, codes, ranks = answers.rows, answers.codes, answers.ranks
+        orders = []
+        for member in membership:
+            keep = member[rows]
+            order = self._ranked_counts(codes[keep], len(vocabulary), ranks[keep])[0]
+            orders.append([vocabulary[code] for code in order])
+        return orders
+
+    def _group_membership(self, by, groups, by_value) -> tuple[np.ndarray, list]:
+        """Return a (groups x rows) boolean membership matrix and the group labels"""
+        n_rows = len(self.data)
+        if by is None:
+            # A single group holding every row
+            return np.ones((1, n_rows), dtype=bool), [None]
+        if isinstance(by, str):
+            codes, vocabulary = self._codes(by)
+            if groups is None:
+                group_codes = np.arange(len(vocabulary))
+                groups = vocabulary.tolist()
+            else:
+                group_codes = vocabulary.get_indexer(pd.Index(groups, dtype=object))
+            # Unknown group values map to -2, which no row code equals
+            group_codes = np.where(group_codes >= 0, group_codes, -2)
+            return group_codes[:, None] == codes[None, :], list(groups)
+
+        if by_value is None:
+            answers = self._answers(by)
+            membership = np.zeros((len(answers.vocabulary), n_rows), dtype=bool)
+            membership[answers.codes, answers.rows] = True
+            labels = answers.vocabulary.tolist()
+            if groups is not None:
+                lookup = answers.vocabulary.get_indexer(pd.Index(groups, dtype=object))
+                membership = np.vstack([membership, np.zeros((1, n_rows), dtype=bool)])[lookup]
+                labels = list(groups)
+            return membership, labels
+
+        membership = np.zeros((len(by), n_rows), dtype=bool)
+        values = self._numeric_values([by_value])
+        for i, col in enumerate(self._present_columns(by)):
+            if col is not None:
+                membership[i] = self._value_hits(col, values)[0]
+        return membership, list(by)
+
+    def _distribution_matrix(self, target, by, groups, by_value, target_value, normalize) -> tuple:
+        if target_value is None and isinstance(by, str):
+            key = target if isinstance(target, str) else tuple(col for col in target if col in self.data.columns)
+            if self._cube_covers(key, by):
+                return self._cube_distribution_matrix(target, key, by, groups, normalize)
+
+        membership, group_labels = self._group_membership(by, groups, by_value)
+
+        # Reduce the target to (row, code) entries over a vocabulary of size_v
+        eligible = None
+        if isinstance(target, str):
+            if target not in self.data.columns:
+                print(f"Column {target} does not exist in the data.")
+                return (), tuple(group_labels), np.zeros((0, len(group_labels)))
+            codes, vocabulary = self._codes(target)
+            rows = np.flatnonzero(codes >= 0)
+            codes = codes[rows]
+            labels = [self._format_key(k) for k in vocabulary.tolist()]
+        elif target_value is None:
+            present = [col for col in target if col in self.data.columns]
+            for col in target:
+                if col not in self.data.columns:
+                    print(f"Column {col} does not exist in the data.")
+            if not present:
+                return (), tuple(group_labels), np.zeros((0, len(group_labels)))
+            answers = self._answers(present)
+            rows, codes = answers.rows, answers.codes
+            labels = answers.vocabulary.tolist()
+        else:
+            # Binary columns: each column is counted against the membership directly, and only rows answering
+            # every column count
+            present = self._present_columns(target)
+            values = self._numeric_values([target_value])
+            eligible = self._answered_rows(present)
+            labels = list(target)
+            counts = np.zeros((len(labels), len(group_labels)), dtype=np.int64)
+            for i, col in enumerate(present):
+                if col is not None:
+                    counts[i] = np.count_nonzero(membership & (self._value_hits(col, values)[0] & eligible), axis=1)
+
+        if eligible is None:
+            size_v, size_g = len(labels), len(group_labels)
+            # Expand entries to every group their row belongs to, then count all (group, code) pairs at once
+            group_ids, entry_ids = np.nonzero(membership[:, rows])
+            counts = np.bincount(
+                group_ids * size_v + codes[entry_ids], minlength=size_g * size_v
+            ).reshape(size_g, size_v).T
+
+        if isinstance(target, str):
+            totals = counts.sum(axis=0)
+        elif eligible is None:
+            totals = membership.sum(axis=1)
+        else:
+            totals = (membership & eligible).sum(axis=1)
+        return self._finish_matrix(counts, totals, labels, group_labels, by, target_value, normalize)
+
+    def _cube_distribution_matrix(self, target, key, by, groups, normalize) -> tuple:
+        """_distribution_matrix for a column or answer family grouped by a cube dimension"""
+        for col in [] if isinstance(target, str) else target:
+            if col not in self.data.columns:
+                print(f"Column {col} does not exist in the data.")
 
-        return pd.DataFrame(result.items(), columns=[columns[0], 'distribution'])
+        by_vocabulary = self.count_cube.vocabulary(by)
+        if groups is None:
+            group_codes = np.arange(len(by_vocabulary))
+            groups = by_vocabulary.tolist()
+        else:
+            group_codes = by_vocabulary.get_indexer(pd.Index(groups, dtype=object))
+        counts, group_rows = self.count_cube.matrix(key, by, group_codes)
+
+        if isinstance(target, str):
+            labels = [self._format_key(k) for k in self._codes(target)[1].tolist()]
+            totals = counts.sum(axis=0)
+        else:
+            labels = self._answers(list(key)).vocabulary.tolist()
+            totals = group_rows
+        return self._finish_matrix(counts, totals, labels, list(groups), by, None, normalize)
+
+    def _finish_matrix(self, counts, totals, labels, group_labels, by, target_value, normalize) -> tuple:
+        """Order the (categories x groups) counts and normalize them by the group totals"""
+        size_v = len(labels)
+        for label, total in zip(group_labels, totals):
+            if total == 0:
+                print(f"Warning: No rows found for group {label} of {by}")
+
+        if target_value is None:
+            # Keep categories seen in any group, most frequent overall first, ties in vocabulary order
+            overall = counts.sum(axis=1)
+            order = np.lexsort((np.arange(size_v), -overall))
+            order = order[overall[order] > 0]
+            counts = counts[order]
+            labels = [labels[i] for i in order]
+
+        values = counts
+        if normalize:
+            values = np.divide(counts, totals, out=np.zeros(counts.shape), where=totals > 0)
+        values.flags.writeable = False
+        return tuple(labels), tuple(group_labels), values
 
 
 if __name__ == "__main__":
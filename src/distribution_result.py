@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+from pptx.chart.data import CategoryChartData
+
+
+class DistributionResult:
+    """Labels and values of a distribution; frames, dicts and chart data are only built on request"""
+    __slots__ = ("labels", "values", "name")
+
+    def __init__(self, labels: np.ndarray, values: np.ndarray, name: str = "distribution"):
+        self.labels = labels
+        self.values = values
+        # Series name used when the result is charted or turned into a frame
+        self.name = name
+        # Results are shared through the query cache, so they must not be changed in place
+        self.labels.flags.writeable = False
+        self.values.flags.writeable = False
+
+    @classmethod
+    def empty(cls, name: str = "distribution") -> "DistributionResult":
+        return cls(np.empty(0, dtype=object), np.empty(0, dtype=float), name)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __iter__(self):
+        return zip(self.labels.tolist(), self.values.tolist())
+
+    def sort(self, by: str = "value", descending: bool = True) -> "DistributionResult":
+        """Return a copy sorted by value or label; ties keep their current order"""
+        if by == "value":
+            order = np.argsort(-self.values if descending else self.values, kind="stable")
+        else:
+            order = np.argsort(self.labels, kind="stable")
+            if descending:
+                order = order[::-1]
+        return DistributionResult(self.labels[order], self.values[order], self.name)
+
+    def top(self, k: int) -> "DistributionResult":
+        """Return the first k entries as views of this result"""
+        return DistributionResult(self.labels[:k], self.values[:k], self.name)
+
+    def fold_other(self, max_categories: int, label: str = "Other") -> "DistributionResult":
+        """Keep the first max_categories entries and sum the rest into one label"""
+        if len(self) <= max_categories:
+            return self
+        labels = np.append(self.labels[:max_categories], np.array([label], dtype=object))
+        values = np.append(self.values[:max_categories], self.values[max_categories:].sum())
+        return DistributionResult(labels, values, self.name)
+
+    def to_dict(self) -> dict:
+        return dict(zip(self.labels.tolist(), self.values.tolist()))
+
+    def to_frame(self, label_column: str = "category", value_column: str | None = None) -> pd.DataFrame:
+        return pd.DataFrame({label_column: self.labels.tolist(), value_column or self.name: self.values})
+
+    def to_chart_data(self, series_name: str | None = None) -> CategoryChartData:
+        """Return single-series chart data with the labels as categories"""
+        chart_data = CategoryChartData()
+        chart_data.categories = self.labels.tolist()
+        chart_data.add_series(series_name or self.name, self.values.tolist())
+        return chart_data
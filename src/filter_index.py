@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+
+class FilterIndex:
+    """Lazily built index of column value -> packed row bitmap, answering equality filters"""
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+        self.rows = len(data)
+        self._bitmaps: dict[str, dict] = {}
+
+    def bitmap(self, column: str, value) -> np.ndarray:
+        """Return the packed bitmap of rows where column == value, building it on first use"""
+        bitmaps = self._bitmaps.setdefault(column, {})
+        if value not in bitmaps:
+            bitmaps[value] = np.packbits(self._equals(column, value))
+        return bitmaps[value]
+
+    def mask(self, column: str, value) -> np.ndarray:
+        """Return a boolean row mask for column == value"""
+        return np.unpackbits(self.bitmap(column, value), count=self.rows).view(bool)
+
+    def invalidate(self, columns: list[str]) -> None:
+        """Drop the bitmaps of columns whose values have changed"""
+        for column in columns:
+            self._bitmaps.pop(column, None)
+
+    def _equals(self, column: str, value) -> np.ndarray:
+        series = self.data[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Compare integer codes instead of values; an unknown value matches nothing
+            code = series.cat.categories.get_indexer([value])[0]
+            if code < 0:
+                return np.zeros(self.rows, dtype=bool)
+            return series.cat.codes.to_numpy() == code
+        return (series == value).to_numpy()
@@ -1,20 +1,46 @@
 import numpy as np
 import pandas as pd
 from pptx import Presentation
+from pptx.chart.chart import Chart
 from pptx.chart.data import CategoryChartData
 from pptx.enum.chart import XL_CHART_TYPE
 from pptx.enum.chart import XL_AXIS_CROSSES, XL_TICK_MARK, XL_TICK_LABEL_POSITION, XL_LABEL_POSITION, XL_LEGEND_POSITION
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN
 from pptx.dml.color import RGBColor
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.oxml.shapes.autoshape import CT_Shape
+from pptx.oxml.shapes.picture import CT_Picture
+from pptx.parts.chart import ChartPart
+from pptx.shapes.autoshape import Shape
+import copy
 import os
+import re
 from datetime import datetime
+from xml.sax.saxutils import escape
+
+from chart_theme import Theme
+from distribution_result import DistributionResult
+
+# Characters python-pptx turns into line breaks, new paragraphs or _xHHHH_ escapes
+_CONTROL_CHARS = re.compile('[\x00-\x08\x0a-\x1f]')
 
 
 class PptGenerator:
-    def __init__(self):
+    def __init__(self, fast_charts: bool = False, theme: Theme | None = None):
         self.prs = Presentation()
         self.current_slide = None
+        # Default styling of every chart; each chart method can be given its own theme
+        self.theme = theme or Theme()
+        # Fast charts are written with their cached values only; the embedded Excel workbook behind
+        # "Edit Data" is left out until embed_chart_workbooks() is called
+        self.fast_charts = fast_charts
+        # Chart key -> (data, chart parts still waiting for that workbook)
+        self._deferred_workbooks: dict[tuple, tuple[CategoryChartData, list[ChartPart]]] = {}
+        # Chart key -> [first chart part with that type, data and style, its XML once it has been copied]
+        self._chart_parts: dict[tuple, list] = {}
     
     def create_title_slide(self, title: str, subtitle: str = ""):
         """Create a title slide with the given title and subtitle"""
@@ -51,47 +77,60 @@ class PptGenerator:
 
         self.current_slide = slide
 
-    def add_image_header_footer_to_all_slides(self, image_path: str):
+    def add_image_header_footer_to_all_slides(self, image_path: str, per_slide: bool = False):
+        """
+        Add the logo header and the survey footer. By default they are placed once on the slide master, which
+        every layout shows; with per_slide they are stamped onto each slide, all sharing one image part.
+        """
         slide_width = self.prs.slide_width
         slide_height = self.prs.slide_height
-    
+
         img_width=Inches(1.85)
         img_height=Inches(0.17)
         left_position = slide_width - img_width - Inches(0.3)
         top_position = Inches(0.3)
-        
-        for slide in self.prs.slides:
-            # Header
-            picture = slide.shapes.add_picture(
-                image_path,
-                left_position,
-                top_position,
-                width=img_width,
-                height=img_height
-            )
-            picture.element.getparent().remove(picture.element)
-            slide.shapes._spTree.insert(2, picture.element)
-            
-            # Footer
-            footer = slide.shapes.add_textbox(
-                left=(slide_width - Inches(6)) / 2,
-                top=slide_height - Inches(0.5),
-                width=Inches(6),
-                height=Inches(0.3)
-            )
-            footer_frame = footer.text_frame
-            footer_frame.text = f"優才資源中心有限公司{datetime.now().year}年DSE考生問卷調查 考生未來勞動力供應剖析"
-            footer_para = footer_frame.paragraphs[0]
-            footer_para.font.size = Pt(12)
-            footer_para.font.color.rgb = RGBColor(100, 100, 100)
-            footer_para.alignment = PP_ALIGN.CENTER           
+
+        # Header, with its image relationship filled in per target
+        picture = CT_Picture.new_pic(
+            0, "Logo", os.path.basename(image_path), "", left_position, top_position, img_width, img_height
+        )
+
+        # Footer
+        footer = CT_Shape.new_textbox_sp(
+            0, "Footer", (slide_width - Inches(6)) / 2, slide_height - Inches(0.5), Inches(6), Inches(0.3)
+        )
+        footer_frame = Shape(footer, None).text_frame
+        footer_frame.text = f"優才資源中心有限公司{datetime.now().year}年DSE考生問卷調查 考生未來勞動力供應剖析"
+        footer_para = footer_frame.paragraphs[0]
+        footer_para.font.size = Pt(12)
+        footer_para.font.color.rgb = RGBColor(100, 100, 100)
+        footer_para.alignment = PP_ALIGN.CENTER
+
+        image_part = None
+        for target in list(self.prs.slides) if per_slide else [self.prs.slide_master]:
+            if image_part is None:
+                image_part, rId = target.part.get_or_add_image_part(image_path)
+            else:
+                rId = target.part.relate_to(image_part, RT.IMAGE)
+
+            # Counted from the shapes alone; the master's other ids belong to its layouts
+            shape_id = max(int(i) for i in target.shapes._spTree.xpath("//p:cNvPr/@id")) + 1
+            target_picture = copy.deepcopy(picture)
+            target_picture.nvPicPr.cNvPr.id = shape_id
+            target_picture.blipFill.blip.rEmbed = rId
+            target_footer = copy.deepcopy(footer)
+            target_footer.nvSpPr.cNvPr.id = shape_id + 1
+
+            # The logo goes behind the other shapes, as the first shape after the tree's own properties
+            target.shapes._spTree.insert(2, target_picture)
+            target.shapes._spTree.append(target_footer)
 
 
     def add_bar_chart(
         self,
-        data: pd.DataFrame,
-        category_column: str,
-        value_columns: list[str],
+        data: pd.DataFrame | DistributionResult,
+        category_column: str | None = None,
+        value_columns: list[str] | None = None,
         title: str = None,
         has_legend: bool = True,
         legend_position: int = 2,  
@@ -101,59 +140,62 @@ class PptGenerator:
         reserve_value_axis: bool = False,
         font_size: int = 14,
         small_title: bool = False,
-        color: str | tuple[int, int, int] = 'blue',
+        color: str | tuple[int, int, int] | None = None,
         x: float = 1,
         y: float = 2,
         cx: float = 8,
         cy: float = 5,
         horizontal: bool = False,
+        theme: Theme | None = None,
     ):
+        theme = theme or self.theme
 
-        if category_column not in data.columns :
-            print(f"Columns {category_column} not found in data")
-            return
-
-        for value_column in value_columns:
-            if value_column not in data.columns:
-                print(f"Value column {value_column} not found in data")
+        if isinstance(data, DistributionResult):
+            # A result is a single series; value_columns only names it
+            value_columns = value_columns or [data.name]
+            if not len(data):
+                print("No data to chart")
+                return
+            chart_data = data.to_chart_data(value_columns[0])
+        else:
+            if category_column not in data.columns :
+                print(f"Columns {category_column} not found in data")
                 return
 
-        if self.current_slide is None:
-            self.create_blank_slide()
+            for value_column in value_columns:
+                if value_column not in data.columns:
+                    print(f"Value column {value_column} not found in data")
+                    return
 
-        # Prepare chart data
-        chart_data = CategoryChartData()
-        chart_data.categories = data[category_column].tolist()
+            # Prepare chart data
+            chart_data = CategoryChartData()
+            chart_data.categories = data[category_column].tolist()
 
-        for value_column in value_columns:
-            chart_data.add_series(value_column, data[value_column].tolist())
+            for value_column in value_columns:
+                chart_data.add_series(value_column, data[value_column].tolist())
+
+        if self.current_slide is None:
+            self.create_blank_slide()
 
         # Choose chart type based on orientation
         chart_type = XL_CHART_TYPE.BAR_CLUSTERED if horizontal else XL_CHART_TYPE.COLUMN_CLUSTERED
         
             
         # Add chart to slide
-        x, y, cx, cy = Inches(x), Inches(y), Inches(cx), Inches(cy)
-        chart = self.current_slide.shapes.add_chart(chart_type, x, y, cx, cy, chart_data).chart
-
-        # Set bar colors if only one series and color is specified
-        if len(value_columns) == 1 and color:
-            series = chart.series[0]
-            for point in series.points:
-                point.format.fill.solid()
-                if isinstance(color, str):
-                    # Accept color as a hex string or color name
-                    if color.startswith('#') and len(color) == 7:
-                        rgb = RGBColor(int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16))
-                    elif hasattr(RGBColor, color.upper()):
-                        rgb = getattr(RGBColor, color.upper())
-                    else:
-                        rgb = RGBColor(102, 204, 255)  # Default blue
-                elif isinstance(color, tuple) and len(color) == 3:
-                    rgb = RGBColor(*color)
-                else:
-                    rgb = RGBColor(102, 204, 255)
-                point.format.fill.fore_color.rgb = rgb
+        style = (
+            "bar", title, has_legend, legend_position, to_percentage, hide_y_axis, opposite_tick_labels,
+            reserve_value_axis, font_size, small_title, color, theme,
+        )
+        chart, created = self._add_chart(chart_type, x, y, cx, cy, chart_data, style)
+        if not created:
+            return
+
+        # A color only applies to single-series charts; otherwise the theme's series colors are used
+        if len(value_columns) == 1:
+            theme.fill_series(chart, theme.bar_color if color is None else color)
+        else:
+            theme.fill_series(chart)
+        font_size = theme.font_pt(font_size)
 
         # Set chart title
         if title is None:
@@ -162,15 +204,12 @@ class PptGenerator:
             chart.has_title = True
             chart.chart_title.text_frame.text = title
             if small_title:
-                title_run = chart.chart_title.text_frame.paragraphs[0].runs[0]
-                title_run.font.size = Pt(12)
-                title_run.font.bold = False
-                title_run.font.name = 'Calibri'
+                theme.style_small_title(chart)
 
         chart.has_legend = has_legend
         if has_legend:
             chart.legend.position = legend_position
-            chart.legend.font.size = Pt(font_size)
+            chart.legend.font.size = font_size
 
             if len(value_columns) == 1 or legend_position == XL_LEGEND_POSITION.BOTTOM:
                 chart.legend.include_in_layout = False
@@ -184,8 +223,8 @@ class PptGenerator:
 
 
         if to_percentage:
-            data_labels.number_format = '0.0%'  # Format as percentage with two decimal places
-            chart.value_axis.tick_labels.number_format = '0%'
+            data_labels.number_format = theme.percent_format
+            chart.value_axis.tick_labels.number_format = theme.percent_axis_format
 
         if hide_y_axis:
             chart.value_axis.visible = False
@@ -200,9 +239,9 @@ class PptGenerator:
             chart.value_axis.reverse_order = True
 
         # Change axis font size
-        chart.category_axis.tick_labels.font.size = Pt(font_size)
-        chart.value_axis.tick_labels.font.size = Pt(font_size)
-        data_labels.font.size = Pt(font_size)
+        chart.category_axis.tick_labels.font.size = font_size
+        chart.value_axis.tick_labels.font.size = font_size
+        data_labels.font.size = font_size
 
         chart.value_axis.has_major_gridlines = False
         chart.category_axis.major_tick_mark = XL_TICK_MARK.NONE
@@ -212,9 +251,9 @@ class PptGenerator:
 
     def add_pie_chart(
         self,
-        data: pd.DataFrame,
-        category_column: str,
-        value_column: str,
+        data: pd.DataFrame | DistributionResult,
+        category_column: str | None = None,
+        value_column: str | None = None,
         to_percent: bool = False,
         title: str | None = None,
         has_legend: bool = True,
@@ -226,36 +265,47 @@ class PptGenerator:
         y: float = 2,
         cx: float = 8,
         cy: float = 5,
+        theme: Theme | None = None,
     ):
+        theme = theme or self.theme
 
-        if category_column not in data.columns or value_column not in data.columns:
-            print(f"Columns {category_column} or {value_column} not found in data")
-            return
+        if isinstance(data, DistributionResult):
+            if not len(data):
+                print("No data to chart")
+                return
+            chart_data = self._pie_chart_data(data, value_column, sort, max_categories)
+        else:
+            if category_column not in data.columns or value_column not in data.columns:
+                print(f"Columns {category_column} or {value_column} not found in data")
+                return
+            chart_data = None
 
         if self.current_slide is None:
             self.create_blank_slide(title)
 
-        pie_data = data.groupby(category_column)[value_column].sum().reset_index()
-        if sort:
-            pie_data = pie_data.sort_values(value_column, ascending=False)
-
-        # Group smaller categories into 'Other'
-        if len(pie_data) > max_categories:
-            top = pie_data.iloc[:max_categories]
-            other = pd.DataFrame({
-                category_column: ['Other'],
-                value_column: [pie_data.iloc[max_categories:][value_column].sum()]
-            })
-            pie_data = pd.concat([top, other], ignore_index=True)
-
-        chart_data = CategoryChartData()
-        chart_data.categories = pie_data[category_column].tolist()
-        chart_data.add_series(value_column, pie_data[value_column].tolist())
-
-        x, y, cx, cy = Inches(x), Inches(y), Inches(cx), Inches(cy)
-        chart = self.current_slide.shapes.add_chart(
-            XL_CHART_TYPE.PIE, x, y, cx, cy, chart_data
-        ).chart
+        if chart_data is None:
+            pie_data = data.groupby(category_column)[value_column].sum().reset_index()
+            if sort:
+                pie_data = pie_data.sort_values(value_column, ascending=False)
+
+            # Group smaller categories into 'Other'
+            if len(pie_data) > max_categories:
+                top = pie_data.iloc[:max_categories]
+                other = pd.DataFrame({
+                    category_column: ['Other'],
+                    value_column: [pie_data.iloc[max_categories:][value_column].sum()]
+                })
+                pie_data = pd.concat([top, other], ignore_index=True)
+
+            chart_data = CategoryChartData()
+            chart_data.categories = pie_data[category_column].tolist()
+            chart_data.add_series(value_column, pie_data[value_column].tolist())
+
+        style = ("pie", title, has_legend, legend_position, font_size, to_percent, theme)
+        chart, created = self._add_chart(XL_CHART_TYPE.PIE, x, y, cx, cy, chart_data, style)
+        if not created:
+            return
+        font_size = theme.font_pt(font_size)
         
         # Set chart title
         if title is None:
@@ -268,12 +318,12 @@ class PptGenerator:
         if has_legend:
             chart.legend.position = legend_position
             chart.legend.include_in_layout = False 
-            chart.legend.font.size = Pt(font_size)
+            chart.legend.font.size = font_size
 
         chart.plots[0].has_data_labels = True
         data_labels = chart.plots[0].data_labels
         data_labels.show_value = True
-        data_labels.font.size = Pt(font_size)
+        data_labels.font.size = font_size
 
         if to_percent:
             data_labels.show_percentage = True
@@ -283,9 +333,9 @@ class PptGenerator:
 
     def add_donut_chart(
         self,
-        data: pd.DataFrame,
-        category_column: str,
-        value_column: str,
+        data: pd.DataFrame | DistributionResult,
+        category_column: str | None = None,
+        value_column: str | None = None,
         to_percent: bool = False,
         sort: bool = True,
         title: str | None = None,
@@ -299,58 +349,68 @@ class PptGenerator:
         y: float = 2,
         cx: float = 8,
         cy: float = 5,
+        theme: Theme | None = None,
     ):
-        
-        if category_column not in data.columns or value_column not in data.columns:
-            print(f"Columns {category_column} or {value_column} not found in data")
-            return
+        theme = theme or self.theme
+
+        if isinstance(data, DistributionResult):
+            if not len(data):
+                print("No data to chart")
+                return
+            chart_data = self._pie_chart_data(data, value_column, sort, max_categories)
+        else:
+            if category_column not in data.columns or value_column not in data.columns:
+                print(f"Columns {category_column} or {value_column} not found in data")
+                return
+            chart_data = None
 
         if self.current_slide is None:
             self.create_blank_slide(title)
 
-        pie_data = data.groupby(category_column)[value_column].sum().reset_index()
-        if sort:
-            pie_data = pie_data.sort_values(value_column, ascending=False)
-
-        # Group smaller categories into 'Other'
-        if len(pie_data) > max_categories:
-            top = pie_data.iloc[:max_categories]
-            other = pd.DataFrame({
-                category_column: ['Other'],
-                value_column: [pie_data.iloc[max_categories:][value_column].sum()]
-            })
-            pie_data = pd.concat([top, other], ignore_index=True)
-
-        chart_data = CategoryChartData()
-        chart_data.categories = pie_data[category_column].tolist()
-
-        chart_data.add_series(value_column, pie_data[value_column].tolist())
-
-        x, y, cx, cy = Inches(x), Inches(y), Inches(cx), Inches(cy)
-        chart = self.current_slide.shapes.add_chart(
-            XL_CHART_TYPE.DOUGHNUT, x, y, cx, cy, chart_data
-        ).chart
+        if chart_data is None:
+            pie_data = data.groupby(category_column)[value_column].sum().reset_index()
+            if sort:
+                pie_data = pie_data.sort_values(value_column, ascending=False)
+
+            # Group smaller categories into 'Other'
+            if len(pie_data) > max_categories:
+                top = pie_data.iloc[:max_categories]
+                other = pd.DataFrame({
+                    category_column: ['Other'],
+                    value_column: [pie_data.iloc[max_categories:][value_column].sum()]
+                })
+                pie_data = pd.concat([top, other], ignore_index=True)
+
+            chart_data = CategoryChartData()
+            chart_data.categories = pie_data[category_column].tolist()
+            chart_data.add_series(value_column, pie_data[value_column].tolist())
+
+        style = (
+            "donut", title, category_column, has_legend, legend_position, has_data_labels, font_size, small_title,
+            to_percent, theme,
+        )
+        chart, created = self._add_chart(XL_CHART_TYPE.DOUGHNUT, x, y, cx, cy, chart_data, style)
+        if not created:
+            return
+        font_size = theme.font_pt(font_size)
 
         # Set chart title
         chart.has_title = True
-        chart.chart_title.text_frame.text = title if title else category_column
+        chart.chart_title.text_frame.text = title if title else category_column or ""
         if small_title:
-            title_run = chart.chart_title.text_frame.paragraphs[0].runs[0]
-            title_run.font.size = Pt(12)
-            title_run.font.bold = False
-            title_run.font.name = 'Calibri'
-            font_size = 10
+            theme.style_small_title(chart)
+            font_size = Pt(10)
 
         chart.has_legend = has_legend
         if has_legend:
             chart.legend.position = legend_position
             chart.legend.include_in_layout = legend_position == 2 
-            chart.legend.font.size = Pt(font_size)
+            chart.legend.font.size = font_size
 
         chart.plots[0].has_data_labels = True
         data_labels = chart.plots[0].data_labels
         data_labels.show_value = True
-        data_labels.font.size = Pt(font_size)
+        data_labels.font.size = font_size
 
         if has_data_labels:
             data_labels.show_category_name = True
@@ -360,6 +420,83 @@ class PptGenerator:
             data_labels.show_value = False
 
 
+    def _add_chart(
+        self,
+        chart_type: XL_CHART_TYPE,
+        x: float,
+        y: float,
+        cx: float,
+        cy: float,
+        chart_data: CategoryChartData,
+        style: tuple = (),
+    ) -> tuple[Chart, bool]:
+        """
+        Add a chart to the current slide at the given position and size in inches, returning it and whether it
+        still needs styling. style must hold every setting the caller applies to the chart afterwards: a chart
+        with the same type, data and style as an earlier one copies that chart's finished XML and shares its
+        workbook, and is returned as already styled.
+        """
+        x, y, cx, cy = Inches(x), Inches(y), Inches(cx), Inches(cy)
+        package = self.prs.part.package
+        partname = package.next_partname(ChartPart.partname_template)
+        key = self._chart_key(chart_type, chart_data, style)
+        source = self._chart_parts.get(key)
+
+        if source is None:
+            # Same as shapes.add_chart(), except that fast charts leave the workbook for later
+            chart_part = ChartPart.load(partname, CT.DML_CHART, package, chart_data.xml_bytes(chart_type))
+            if self.fast_charts:
+                self._deferred_workbooks[key] = (chart_data, [chart_part])
+            else:
+                chart_part.chart_workbook.update_from_xlsx_blob(chart_data.xlsx_blob)
+            self._chart_parts[key] = [chart_part, None]
+        else:
+            # The first chart has been styled by now, so its XML is final
+            if source[1] is None:
+                source[1] = source[0].blob
+            chart_part = ChartPart.load(partname, CT.DML_CHART, package, source[1])
+            xlsx_part = source[0].chart_workbook.xlsx_part
+            if xlsx_part is not None:
+                chart_part.chart_workbook.xlsx_part = xlsx_part
+            elif key in self._deferred_workbooks:
+                self._deferred_workbooks[key][1].append(chart_part)
+
+        shapes = self.current_slide.shapes
+        rId = self.current_slide.part.relate_to(chart_part, RT.CHART)
+        shapes._add_chart_graphicFrame(rId, x, y, cx, cy)
+        shapes._recalculate_extents()
+        return chart_part.chart, source is None
+
+    @staticmethod
+    def _chart_key(chart_type: XL_CHART_TYPE, chart_data: CategoryChartData, style: tuple) -> tuple:
+        """Key identifying a chart by its type, data and style"""
+        categories = tuple(category.label for category in chart_data.categories)
+        series = tuple((series.name, tuple(series.values)) for series in chart_data)
+        return (chart_type, categories, series, chart_data.number_format, style)
+
+    def embed_chart_workbooks(self) -> int:
+        """Embed the workbooks left out of fast charts so their data can be edited; returns how many were added"""
+        for chart_data, chart_parts in self._deferred_workbooks.values():
+            chart_parts[0].chart_workbook.update_from_xlsx_blob(chart_data.xlsx_blob)
+            for chart_part in chart_parts[1:]:
+                # Identical charts share one workbook
+                chart_part.chart_workbook.xlsx_part = chart_parts[0].chart_workbook.xlsx_part
+        count = len(self._deferred_workbooks)
+        self._deferred_workbooks.clear()
+        return count
+
+    @staticmethod
+    def _pie_chart_data(
+        data: DistributionResult, value_column: str | None, sort: bool, max_categories: int
+    ) -> CategoryChartData:
+        """Chart data for a pie or donut: categories in label order (largest first if sort), the rest as 'Other'"""
+        pie_data = data.sort(by="label", descending=False)
+        if sort:
+            # pandas' own sort, so ties land where the DataFrame path puts them
+            order = pd.Series(pie_data.values).sort_values(ascending=False).index.to_numpy()
+            pie_data = DistributionResult(pie_data.labels[order], pie_data.values[order], pie_data.name)
+        return pie_data.fold_other(max_categories).to_chart_data(value_column)
+
     def add_stacked_bar(
             self,
             data: pd.DataFrame,
@@ -372,7 +509,9 @@ class PptGenerator:
             y: float = 2,
             cx: float = 8,
             cy: float = 5,
+            theme: Theme | None = None,
         ):
+        theme = theme or self.theme
         if self.current_slide is None:
             self.create_blank_slide()
 
@@ -382,10 +521,12 @@ class PptGenerator:
         for value_column in value_columns:
             chart_data.add_series(value_column, data[value_column].tolist())
 
-        x, y, cx, cy = Inches(x), Inches(y), Inches(cx), Inches(cy)
-        chart = self.current_slide.shapes.add_chart(
-            XL_CHART_TYPE.BAR_STACKED, x, y, cx, cy, chart_data
-        ).chart
+        style = ("stacked_bar", title, legend_position, font_size, theme)
+        chart, created = self._add_chart(XL_CHART_TYPE.BAR_STACKED, x, y, cx, cy, chart_data, style)
+        if not created:
+            return
+        theme.fill_series(chart)
+        font_size = theme.font_pt(font_size)
 
         # Set chart title
         chart.has_title = True
@@ -394,19 +535,19 @@ class PptGenerator:
         chart.has_legend = True
         chart.legend.position = legend_position
         chart.legend.include_in_layout = False
-        chart.legend.font.size = Pt(font_size)
+        chart.legend.font.size = font_size
         
-        chart.value_axis.tick_labels.number_format = '0%'
+        chart.value_axis.tick_labels.number_format = theme.percent_axis_format
         chart.value_axis.maximum_scale = 1
-        chart.value_axis.tick_labels.font.size = Pt(font_size)
+        chart.value_axis.tick_labels.font.size = font_size
 
-        chart.category_axis.tick_labels.font.size = Pt(font_size)
+        chart.category_axis.tick_labels.font.size = font_size
 
         chart.plots[0].has_data_labels = True
         data_labels = chart.plots[0].data_labels
         data_labels.show_value = True
-        data_labels.number_format = '0.0%'
-        data_labels.font.size = Pt(font_size)
+        data_labels.number_format = theme.percent_format
+        data_labels.font.size = font_size
 
     def add_table(
         self,
@@ -419,48 +560,87 @@ class PptGenerator:
         cx: float = 8,
         cy: float = 5,
         font_size: int = 12,
+        max_rows_per_slide: int | None = None,
     ):
-        """Add a table to the current slide"""
+        """
+        Add a table to the current slide. With max_rows_per_slide and no fixed rows/cols grid, the box cy holds
+        max_rows_per_slide rows plus the header; further rows, and rows that would pass the footer, continue on
+        new slides with the same title and header row, and the last one becomes the current slide.
+        """
         if self.current_slide is None:
             self.create_blank_slide()
-        
-        if rows is None or cols is None:
+
+        fixed_grid = rows is not None and cols is not None
+        if not fixed_grid:
             rows = len(data) + 1  # +1 for header row
-            cols = len(data.columns) + 1 if index else len(data.columns) 
-
-        table = self.current_slide.shapes.add_table(rows, cols, Inches(x), Inches(y), Inches(cx), Inches(cy)).table
-
-
-        # Fill the table with data, first column as index
-        for i, col in enumerate(data.columns):
-            cell = table.cell(0, i + 1 if index else i)
-            cell.text = col
-
-        if index:
-            for j in range(1, rows):
-                if j - 1 >= len(data):
-                    break
-                index_cell = table.cell(j, 0)
-                index_cell.text = str(data.index[j - 1])
-
-
-        for i, col in enumerate(data.columns):
-            if index and i + 1 >= cols:
-                break
-            if not index and i >= cols:
-                break
-            for j in range(len(data)):
-                if j + 1 >= rows:
-                    break 
-                data_cell = table.cell(j + 1, i + 1 if index else i)
-                data_cell.text = str(data.iloc[j][col])
-
-        # Set font size for all cells in a separate loop
-        for row in range(rows):
-            for col in range(cols):
-                cell = table.cell(row, col)
-                for paragraph in cell.text_frame.paragraphs:
-                    paragraph.font.size = Pt(font_size)
+            cols = len(data.columns) + 1 if index else len(data.columns)
+        if fixed_grid or not max_rows_per_slide or len(data) <= max_rows_per_slide:
+            self._write_table(data, rows, cols, index, x, y, Inches(cx), Inches(cy), font_size)
+            return
+
+        row_height = Inches(cy) // (max_rows_per_slide + 1)
+        footer_top = self.prs.slide_height - Inches(0.6)
+        fitting_rows = int((footer_top - Inches(y)) // row_height) - 1
+        page_rows = max(min(max_rows_per_slide, fitting_rows), 1)
+
+        title_shape = self.current_slide.shapes.title
+        title = title_shape.text if title_shape is not None else None
+        for start in range(0, len(data), page_rows):
+            if start:
+                self.create_blank_slide(title)
+            page = data.iloc[start:start + page_rows]
+            self._write_table(
+                page, len(page) + 1, cols, index, x, y, Inches(cx), row_height * (len(page) + 1), font_size
+            )
+
+    def _write_table(
+        self, data: pd.DataFrame, rows: int, cols: int, index: bool, x: float, y: float, cx: int, cy: int,
+        font_size: int,
+    ):
+        """Add a rows x cols table filled from data, building every row's XML in one pass"""
+        table = self.current_slide.shapes.add_table(rows, cols, Inches(x), Inches(y), cx, cy).table
+        offset = 1 if index else 0
+        n_rows = min(len(data), rows - 1)
+        n_cols = min(len(data.columns), cols - offset)
+
+        # Blank grid of rows x cols texts, header first, with data truncated to the grid
+        texts = [[''] * cols for _ in range(rows)]
+        for i, col in enumerate(data.columns[:cols - offset]):
+            texts[0][i + offset] = str(col)
+        # The whole block at once, converted to the same common dtype a row of data holds
+        values = data.iloc[:n_rows, :n_cols].to_numpy()
+        for j in range(n_rows):
+            row = texts[j + 1]
+            if index:
+                row[0] = str(data.index[j])
+            row[offset:offset + n_cols] = [str(value) for value in values[j]]
+
+        # Line breaks and control characters need python-pptx's handling, so those cells are set afterwards
+        special = []
+        paragraph_start = f'<a:tc><a:txBody><a:bodyPr/><a:lstStyle/><a:p><a:pPr><a:defRPr sz="{font_size * 100}"/></a:pPr>'
+        paragraph_end = '</a:p></a:txBody><a:tcPr/></a:tc>'
+        xml = [f'<a:tbl {nsdecls("a")}>']
+        for j, (tr, row) in enumerate(zip(table._tbl.tr_lst, texts)):
+            xml.append(f'<a:tr h="{tr.h}">')
+            for i, text in enumerate(row):
+                if _CONTROL_CHARS.search(text):
+                    special.append((j, i, text))
+                    text = ''
+                run = f'<a:r><a:t>{escape(text)}</a:t></a:r>' if text else ''
+                xml.append(paragraph_start + run + paragraph_end)
+            xml.append('</a:tr>')
+        xml.append('</a:tbl>')
+
+        tbl = table._tbl
+        for tr in tbl.tr_lst:
+            tbl.remove(tr)
+        tbl.extend(parse_xml(''.join(xml)).tr_lst)
+
+        for j, i, text in special:
+            cell = table.cell(j, i)
+            cell.text = text
+            for paragraph in cell.text_frame.paragraphs:
+                paragraph.font.size = Pt(font_size)
 
     def add_textbox(
         self,
@@ -3,8 +3,11 @@ from dataclasses import dataclass
 import streamlit as st
 
 from ppt_generator import PptGenerator
+from data_cache import DATA_CACHE_DIR
 from data_reader import DataReader
+from survey_schema import SCHEMA
 from data_validator import DataValidator
+from validation_result import ValidationResult
 from processors.background_processor import BackgroundProcessor
 from processors.after_dse_processor import AfterDSEProcessor
 from processors.major_processor import MajorProcessor
@@ -16,13 +19,26 @@ from processors.gba_processor import GBAProcessor
 class Config:
     data_file: str = "data/2025data.xlsx"
     output_path: str = "output/presentation.pptx"
+    cache_dir: str | None = DATA_CACHE_DIR
+    streaming: bool = False
+    # Precompute answer counts per demographic group so filtered and grouped charts skip the rows
+    count_cube: bool = False
+    # Write charts without their embedded Excel data; the deck renders the same but chart data cannot be edited
+    fast_charts: bool = False
 
 
 class PresentationGenerator:
     def __init__(self, config: Config):
-        self.data_reader = DataReader(config.data_file)
-        self.data_validator = DataValidator(self.data_reader.data)
-        self.ppt_generator = PptGenerator()
+        # Columns, value rules and cleaning all come from the one schema the reader keeps
+        self.data_reader = DataReader(
+            config.data_file, cache_dir=config.cache_dir, columns=SCHEMA.required_columns, streaming=config.streaming,
+            value_rules=SCHEMA.value_rules, schema=SCHEMA, count_cube=config.count_cube,
+        )
+        self.data_validator = DataValidator(
+            self.data_reader.data, self.data_reader.value_results, self.data_reader.profiles,
+            schema=self.data_reader.schema,
+        )
+        self.ppt_generator = PptGenerator(fast_charts=config.fast_charts)
         self.output_path = config.output_path
 
         self.background_processor = BackgroundProcessor(self.data_reader, self.ppt_generator)
@@ -36,13 +52,20 @@ class PresentationGenerator:
         """Validate if the required columns are present in the data"""
         return self.data_validator.validate_column()
 
-    def validate_values(self) -> list[dict]:
+    def validate_values(self) -> list[ValidationResult]:
         """Validate specific columns for acceptable values"""
         return self.data_validator.validate_value()
     
-    def replace_invalid_values(self, validate_results: list[dict]) -> None:
-        """Replace invalid values in the data with NaN"""
-        self.data_reader.replace_invalid_values(validate_results)
+    def profile_data(self) -> pd.DataFrame:
+        """Return the profile of every loaded column"""
+        return self.data_reader.profile()
+
+    def replace_invalid_values(self, validate_results: list[ValidationResult]) -> dict[str, int]:
+        """Replace invalid values in the data with NaN, returning the cells replaced per column"""
+        replaced = self.data_reader.replace_invalid_values(validate_results)
+        # Later validations report the replaced data
+        self.data_validator.value_results = self.data_reader.value_results
+        return replaced
 
     def generate_presentation(self):
         try:
@@ -90,6 +113,9 @@ class PresentationGenerator:
         except Exception as e:
             st.write(f"Error saving presentation: {e}")
 
+        cache_info = self.data_reader.query_cache.info()
+        print(f"Query cache: {cache_info['hits']} hits, {cache_info['misses']} misses")
+
 
 if __name__ == "__main__":
     config = Config()
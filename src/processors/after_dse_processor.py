@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import streamlit as st
 from data_reader import DataReader
@@ -14,10 +15,9 @@ class AfterDSEProcessor:
     def _process_page1(self):
         self.ppt_generator.create_blank_slide("考生DSE後第一階段計劃")
 
-        plan_dis = self.data_reader.get_binary_distribution(
-            ["大學", "副學士", "文憑", "高級文憑", "工作", "工作假期", "其他"],
+        plan_dis = self.data_reader.binary_distribution(
+            self.data_reader.schema.group("after_dse_plan"),
             unique=True,
-            return_dict=False
         )
 
         self.ppt_generator.add_pie_chart(
@@ -27,7 +27,7 @@ class AfterDSEProcessor:
             legend_position=XL_LEGEND_POSITION.BOTTOM,
             x=5, y=2, cx=5, cy=5,
         )
-        plan_dis.set_index('category', inplace=True)
+        plan_dis = plan_dis.to_frame('category').set_index('category')
         current_year = str(datetime.now().year)
         plan_dis[current_year] = (plan_dis['distribution'] * 100).round(1).astype(str) + '%'
         plan_dis.drop(columns=['distribution'], inplace=True)
@@ -41,10 +41,9 @@ class AfterDSEProcessor:
     def _process_page2(self):
         self.ppt_generator.create_blank_slide("考生DSE後第二階段計劃")
         col = "試後計劃"
-        plan_dis = self.data_reader.get_col_distribution(
+        plan_dis = self.data_reader.col_distribution(
             col,
             normalize=True,
-            return_dict=False,
         )
         
         self.ppt_generator.add_pie_chart(
@@ -55,7 +54,7 @@ class AfterDSEProcessor:
             x=5, y=2, cx=5, cy=5,
         )
 
-        plan_dis.set_index(col, inplace=True)
+        plan_dis = plan_dis.to_frame(col).set_index(col)
         current_year = str(datetime.now().year)
         plan_dis[current_year] = (plan_dis['distribution'] * 100).round(1).astype(str) + '%'
         plan_dis.drop(columns=['distribution'], inplace=True)
@@ -69,15 +68,14 @@ class AfterDSEProcessor:
     def _process_page34(self):
         self.ppt_generator.create_blank_slide("考生升學地方")
 
-        location_dis = []
-        for i in range(1, 5):
-            location_dis.append(
-                self.data_reader.get_binary_distribution(
-                    ["香港", "內地", "亞洲", "歐美澳"],
-                    value=i,
-                    return_dict=False
-                ).rename(columns={'distribution': str(datetime.now().year)})
-            )
+        location_ranks = self.data_reader.get_rank_distribution(
+            self.data_reader.schema.group("study_location"),
+            values=[1, 2, 3, 4]
+        )
+        location_dis = [
+            location_ranks[i].rename(str(datetime.now().year)).reset_index()
+            for i in location_ranks.columns
+        ]
 
         self.ppt_generator.add_bar_chart(
             location_dis[0], 'category', [str(datetime.now().year)],
@@ -114,23 +112,17 @@ class AfterDSEProcessor:
     def _process_page56(self):
         self.ppt_generator.create_blank_slide("考生升學地方 (學校Banding) ")
 
-        bandings_location_dis = [
-            self.data_reader.get_binary_distribution(
-                ["香港", "內地", "亞洲", "歐美澳"],
-                filter_column="Banding",
-                filter_value=banding,
-                return_dict=False
-            ).set_index('category').rename(columns={'distribution': banding}) 
-            for banding in ["Band 1", "Band 2", "Band 3"]
-        ]
-
-        bandings_location_df = pd.concat(bandings_location_dis, axis=1)
-        bandings_location_df = bandings_location_df.reset_index().rename(columns={"index": "category"})
+        bandings_location_df = self.data_reader.get_distribution_matrix(
+            self.data_reader.schema.group("study_location"),
+            by="Banding",
+            groups=self.data_reader.schema.values("Banding"),
+            target_value=1
+        ).rename_axis(index="category", columns=None).reset_index()
 
         self.ppt_generator.add_bar_chart(
             bandings_location_df,
             category_column='category',
-            value_columns=['Band 1', 'Band 2', 'Band 3'],
+            value_columns=self.data_reader.schema.values("Banding"),
             title='2025 考生升學地方',
             to_percentage=True,
             x=1, y=2, cx=8, cy=4
@@ -138,12 +130,8 @@ class AfterDSEProcessor:
 
         self.ppt_generator.create_blank_slide("考生希望升讀的大學")
 
-        university_dis = self.data_reader.get_binary_distribution(
-            [
-            "浸會大學", "中文大學", "城市大學", "教育大學", "恒生大學", "香港大學",
-            "嶺南大學", "都會大學", "理工大學", "聖方濟各大學", "樹仁大學", "科技大學", "自資學院"
-            ],
-            return_dict=False
+        university_dis = self.data_reader.binary_distribution(
+            self.data_reader.schema.group("university"),
         )
         
         self.ppt_generator.add_bar_chart(
@@ -164,17 +152,17 @@ class AfterDSEProcessor:
             "嶺南大學", "樹仁大學", "都會大學", "恒生大學", "聖方濟各大學", "自資學院"
         ]
 
-        data = [self.data_reader.get_combined_distribution(
-            ["希望修讀", "希望修讀_A", "希望修讀_B"],
-            filtered_column=col,
-            filter_value=1
-        )[:2] for col in cols]
-
-        combined_df = pd.DataFrame()
-        for i, df in enumerate(data):
-            combined_df[cols[i]] = df['希望修讀'].astype(str) + ' ' + (df['distribution'] * 100).round(1).astype(str) + '%'
-
-        combined_df.index = ['1st', '2nd']
+        # Top two majors of every university in one call
+        top_majors = self.data_reader.get_top_k(self.data_reader.schema.family("希望修讀"), 2, by=cols)
+
+        combined_df = pd.DataFrame(index=['1st', '2nd'])
+        for col in cols:
+            majors = top_majors[col]
+            cells = [
+                f"{major} {share}%"
+                for major, share in zip(majors.labels.tolist(), np.round(majors.values * 100, 1).tolist())
+            ]
+            combined_df[col] = cells + [""] * (2 - len(cells))
         self.ppt_generator.add_table(
             combined_df,
             x=0.5, y=2, cx=9, cy=3,
@@ -185,17 +173,19 @@ class AfterDSEProcessor:
     def _process_page8(self):
         self.ppt_generator.create_blank_slide("考生接收升學及就業資訊活動和成效")
 
-        cols = ["大學入學講座","升學展覽","職業博覽","生涯規劃","團體師友","工作影子"]
+        cols = self.data_reader.schema.group_items("activity_attended")
+        attended = self.data_reader.schema.group("activity_attended")
+        usefulness = self.data_reader.schema.group("activity_usefulness")
 
-        data_A = [self.data_reader.get_col_distribution(col + "_A", normalize=True, return_dict=True) for col in cols]
+        data_A = [self.data_reader.get_col_distribution(col, normalize=True, return_dict=True) for col in attended]
         data_B = [
             self.data_reader.get_col_distribution(
-                col + "_B",
+                col_B,
                 normalize=True,
                 return_dict=True, 
-                filter_column=col + "_A", 
+                filter_column=col_A, 
                 filter_value="有"
-            ) for col in cols
+            ) for col_A, col_B in zip(attended, usefulness)
         ]
 
         df_A = pd.DataFrame(data_A)
@@ -233,8 +223,7 @@ class AfterDSEProcessor:
     def _process_page9(self):
         self.ppt_generator.create_blank_slide("影響考生選科因素")
 
-        cols = ["學科知識", "院校因素", "大學學費", "助學金", "主要行業", "朋輩老師", 
-            "家庭因素", "預期收入", "DSE成績", "高中選修科目"]
+        cols = self.data_reader.schema.group("study_factor")
 
         data = [
             self.data_reader.get_col_distribution(col, normalize=True, return_dict=True) 
@@ -13,7 +13,7 @@ class BackgroundProcessor:
         self.ppt_generator.create_blank_slide("背景資料")
 
         col = "Banding"
-        banding_dis = self.data_reader.get_col_distribution(col, normalize=False)
+        banding_dis = self.data_reader.col_distribution(col, normalize=False)
         self.ppt_generator.add_donut_chart(
             banding_dis, col, 'distribution',
             to_percent=False, title="受訪學生",
@@ -32,7 +32,7 @@ class BackgroundProcessor:
             ratio = "N/A"
 
         text = "".join([
-            f"{self.data_reader.data['學校編號'].nunique()}間中學\n\n",
+            f"{self.data_reader.profiles['學校編號'].cardinality}間中學\n\n",
             f"{len(self.data_reader.data)}受訪學生\n\n",
             f"男 : 女 = {ratio}",
         ])
@@ -48,7 +48,7 @@ class BackgroundProcessor:
         self.ppt_generator.create_blank_slide("考生背景")
 
         col = "父母教育程度"
-        edu_bg = self.data_reader.get_col_distribution(col, normalize=False)
+        edu_bg = self.data_reader.col_distribution(col, normalize=False)
         self.ppt_generator.add_donut_chart(
             edu_bg, col, "distribution",
             to_percent=True,
@@ -59,7 +59,7 @@ class BackgroundProcessor:
         )
 
         col = "高中選修學科"
-        edu_bg = self.data_reader.get_col_distribution(col, normalize=False)
+        edu_bg = self.data_reader.col_distribution(col, normalize=False)
         self.ppt_generator.add_donut_chart(
             edu_bg, col, "distribution",
             title="高中選修學科",
@@ -70,7 +70,7 @@ class BackgroundProcessor:
         )
 
         self.ppt_generator.create_blank_slide("考生中五成績")
-        cols = ["中文成績", "英文成績", "數學成績"]
+        cols = self.data_reader.schema.group("score")
         data = [self.data_reader.get_col_distribution(col, normalize=True, return_dict=True) for col in cols]
 
         data = pd.DataFrame(data, index=cols).reset_index()
@@ -98,7 +98,7 @@ class BackgroundProcessor:
         graph_y = 1.7
 
         chin = self.data_reader.get_combined_distribution(
-            columns=["希望修讀", "希望修讀_A", "希望修讀_B"],
+            columns=self.data_reader.schema.family("希望修讀"),
             filtered_column="中文成績",
             filter_value="25-49 分",
         ).head(5)
@@ -116,7 +116,7 @@ class BackgroundProcessor:
         )
 
         eng = self.data_reader.get_combined_distribution(
-            columns=["希望修讀", "希望修讀_A", "希望修讀_B"],
+            columns=self.data_reader.schema.family("希望修讀"),
             filtered_column="英文成績",
             filter_value="25-49 分",
         ).head(5) 
@@ -133,7 +133,7 @@ class BackgroundProcessor:
         )
 
         math = self.data_reader.get_combined_distribution(
-            columns=["希望修讀", "希望修讀_A", "希望修讀_B"],
+            columns=self.data_reader.schema.family("希望修讀"),
             filtered_column="數學成績",
             filter_value="25-49 分",
 
@@ -24,8 +24,8 @@ class GBAProcessor:
         )       
 
         
-        gba = self.data_reader.get_col_distribution(
-            "大灣區了解", normalize=True, return_dict=False
+        gba = self.data_reader.col_distribution(
+            "大灣區了解", normalize=True
         )
 
         self.ppt_generator.add_donut_chart(
@@ -45,11 +45,7 @@ class GBAProcessor:
         self.ppt_generator.create_blank_slide("大灣區政策香港定位")
         self.ppt_generator.create_blank_slide("考生接收大灣區資訊來源")
         
-        cols = [
-            "公社科","內地考察",
-            "政府資訊","新聞媒體","網上資訊",
-            "內地交流","校內講座","朋輩及老師"
-        ]
+        cols = self.data_reader.schema.group("gba_source")
         data = [
             self.data_reader.get_col_distribution(
                 col_name, 
@@ -142,18 +138,14 @@ class GBAProcessor:
     def _process_gba_page3(self):
         self.ppt_generator.create_blank_slide("考生對大灣區擇業的影響因素")
 
-        cols = [
-            "個人興趣及性格", "個人能力", "晉升機會",
-            "工作性質", "行業前景", "工作環境",
-            "工作量", "薪水福利", "生活成本", "國家貢獻"
-        ]
+        cols = self.data_reader.schema.group_items("gba_factor")
 
         data = [
             self.data_reader.get_col_distribution(
-                col_name + "_gba", 
+                col_name, 
                 normalize=True,
                 return_dict=True
-            ) for col_name in cols]
+            ) for col_name in self.data_reader.schema.group("gba_factor")]
 
         data = pd.DataFrame(data).sort_values(by="1.0", ascending=True)
         data["index"] = cols
@@ -186,17 +178,17 @@ class GBAProcessor:
             st.error(f"Failed to process GBA page 2: {str(e)}")
             
         try:
-            self._process_gba_major_or_job_page("對大灣區政策了解不同程度下受歡迎科目", ["希望修讀", "希望修讀_A", "希望修讀_B"], ["金融"])
+            self._process_gba_major_or_job_page("對大灣區政策了解不同程度下受歡迎科目", self.data_reader.schema.family("希望修讀"), ["金融"])
         except Exception as e:
             st.error(f"Failed to process GBA popular majors page: {str(e)}")
             
         try:
-            self._process_gba_major_or_job_page("對大灣區政策了解程度不同下不受歡迎科目", ["不希望修讀", "不希望修讀_A", "不希望修讀_B"], ["法律"])
+            self._process_gba_major_or_job_page("對大灣區政策了解程度不同下不受歡迎科目", self.data_reader.schema.family("不希望修讀"), ["法律"])
         except Exception as e:
             st.error(f"Failed to process GBA unpopular majors page: {str(e)}")
             
         try:
-            self._process_gba_major_or_job_page("對大灣區政策了解程度不同下受歡職業", ["希望從事", "希望從事_A", "希望從事_B"], ["銀行/金融", "創業"])
+            self._process_gba_major_or_job_page("對大灣區政策了解程度不同下受歡職業", self.data_reader.schema.family("希望從事"), ["銀行/金融", "創業"])
         except Exception as e:
             st.error(f"Failed to process GBA popular jobs page: {str(e)}")
             
@@ -14,7 +14,7 @@ class JobProcessor:
     def _process_page1(self):
         self.ppt_generator.create_blank_slide("未來工作地點")
         col = "工作地方"
-        location = self.data_reader.get_col_distribution(col, normalize=True, return_dict=False)
+        location = self.data_reader.col_distribution(col, normalize=True)
 
         self.ppt_generator.add_pie_chart(
             location, col, 'distribution',
@@ -33,16 +33,8 @@ class JobProcessor:
     def _process_page_filtered_by_location(self, location: str):
         self.ppt_generator.create_blank_slide(f"未來工作地點：{location}")
 
-        filter_map = {
-            "香港": "香港",
-            "內地": "內地",
-            "亞洲": "國外 - 亞洲",
-            "歐美澳": "國外 - 歐美澳"
-        }
-        gender = self.data_reader.get_col_distribution(
-            "性別", normalize=True, return_dict=False,
-            filter_column="工作地方", filter_value=filter_map[location]
-        )
+        filter_map = self.data_reader.schema.labels("工作地方")
+        gender = self.data_reader.get_top_k("性別", None, by="工作地方")[filter_map[location]]
 
         self.ppt_generator.add_donut_chart(
             gender, "性別", "distribution",
@@ -54,10 +46,7 @@ class JobProcessor:
             x=0.3, y=1.2, cx=3, cy=3
         )   
 
-        gba = self.data_reader.get_col_distribution(
-            "大灣區了解", normalize=True, return_dict=False,
-            filter_column="工作地方", filter_value=filter_map[location]
-        )
+        gba = self.data_reader.get_top_k("大灣區了解", None, by="工作地方")[filter_map[location]]
         self.ppt_generator.add_donut_chart(
             gba, "大灣區了解", "distribution",
             to_percent=True,
@@ -68,10 +57,7 @@ class JobProcessor:
             x=0.3, y=4, cx=3.5, cy=3.5
         )
 
-        gba = self.data_reader.get_col_distribution(
-            "高中選修學科", normalize=True, return_dict=False,
-            filter_column="工作地方", filter_value=filter_map[location]
-        )
+        gba = self.data_reader.get_top_k("高中選修學科", None, by="工作地方")[filter_map[location]]
         self.ppt_generator.add_donut_chart(
             gba, "高中選修學科", "distribution",
             to_percent=True,
@@ -82,11 +68,9 @@ class JobProcessor:
             x=2.8, y=2.5, cx=3.5, cy=3.5
         )
 
-        major = self.data_reader.get_combined_distribution(
-            columns=["希望修讀", "希望修讀_A", "希望修讀_B"],
-            filtered_column="工作地方",
-            filter_value=filter_map[location]
-        )[:5]
+        major = self.data_reader.get_top_k(self.data_reader.schema.family("希望修讀"), 5, by="工作地方")[
+            filter_map[location]
+        ]
 
         self.ppt_generator.add_bar_chart(
             major,
@@ -99,11 +83,9 @@ class JobProcessor:
             x=6, y=1.2, cx=4, cy=3
         )
         
-        job = self.data_reader.get_combined_distribution(
-            columns=["希望從事", "希望從事_A", "希望從事_B"],
-            filtered_column="工作地方",
-            filter_value=filter_map[location]
-        )[:5]
+        job = self.data_reader.get_top_k(self.data_reader.schema.family("希望從事"), 5, by="工作地方")[
+            filter_map[location]
+        ]
 
         self.ppt_generator.add_bar_chart(
             job,
@@ -119,14 +101,11 @@ class JobProcessor:
 
     def _process_page2(self):
         self.ppt_generator.create_blank_slide("考生擇業條件")
-        cols = [
-            "個人能力", "個人興趣性格", "成就感", "家庭因素", "人際關係",
-            "工作性質", "工作模式", "工作量", "工作環境", "薪水及褔利",
-            "晉升機會", "發展前景", "社會貢獻", "社會地位"
-        ]
+        cols = self.data_reader.schema.group_items("job_factor")
         
         dis = [
-            self.data_reader.get_col_distribution(col + "_B", normalize=True, return_dict=True) for col in cols
+            self.data_reader.get_col_distribution(col, normalize=True, return_dict=True)
+            for col in self.data_reader.schema.group("job_factor")
         ]
         dis = pd.DataFrame(dis, index=cols).reset_index()
 
@@ -148,10 +127,7 @@ class JobProcessor:
     def _process_major_preference_page(self, title:str, cols: list[str]):
         self.ppt_generator.create_blank_slide(title)
 
-        job_data = self.data_reader.get_combined_distribution(
-            columns=cols,
-            return_dict=False
-        ).head(5)
+        job_data = self.data_reader.get_top_k(cols, 5)
 
         self.ppt_generator.add_bar_chart(
             job_data,
@@ -162,8 +138,8 @@ class JobProcessor:
             x=3.5, cx=6
         )
 
-        jobs = job_data[cols[0]].tolist()
-        distribution = job_data["distribution"].tolist()
+        jobs = job_data.labels.tolist()
+        distribution = job_data.values.tolist()
         if len(jobs) >= 5:
             text = (
                 f"第一位 {jobs[0]} {distribution[0]*100:.1f}%\n",
@@ -181,17 +157,8 @@ class JobProcessor:
     def _process_gender_major_preference_page(self, title: str, cols: list[str]):
         self.ppt_generator.create_blank_slide(title)
 
-        male_data = self.data_reader.get_combined_distribution(
-            cols,
-            filtered_column="性別",
-            filter_value="男"
-        )[:5]
-
-        female_data = self.data_reader.get_combined_distribution(
-           cols,
-           filtered_column="性別",
-           filter_value="女"
-       )[:5]
+        gender_data = self.data_reader.get_top_k(cols, 5, by="性別", groups=self.data_reader.schema.values("性別"))
+        male_data, female_data = gender_data["男"], gender_data["女"]
 
         self.ppt_generator.add_bar_chart(
             male_data,
@@ -231,14 +198,14 @@ class JobProcessor:
     
     def _process_least_popular_job(self):
         least_popular_job = self.data_reader.get_combined_distribution(
-            ["不希望從事", "不希望從事_A", "不希望從事_B"],
+            self.data_reader.schema.family("不希望從事"),
         ).head(1)["不希望從事"].values[0]
 
         self.ppt_generator.create_blank_slide(f"最不受歡迎職業：{least_popular_job} (背景資料)")
 
-        gender = self.data_reader.get_col_distribution(
+        gender = self.data_reader.col_distribution(
             "性別",  
-            ["不希望從事", "不希望從事_A", "不希望從事_B"],
+            self.data_reader.schema.family("不希望從事"),
             least_popular_job,
             normalize=True, 
         
@@ -252,9 +219,9 @@ class JobProcessor:
             x=0.0, y=1.7, cx=3, cy=3,
         )
 
-        banding = self.data_reader.get_col_distribution(
+        banding = self.data_reader.col_distribution(
             "Banding", 
-            ["不希望從事", "不希望從事_A", "不希望從事_B"],
+            self.data_reader.schema.family("不希望從事"),
             least_popular_job,
             normalize=True,
         )
@@ -267,9 +234,9 @@ class JobProcessor:
             x=2.3, y=1.7, cx=3, cy=3,
         )
 
-        elective = self.data_reader.get_col_distribution(
+        elective = self.data_reader.col_distribution(
             "高中選修學科", 
-            ["不希望從事", "不希望從事_A", "不希望從事_B"],
+            self.data_reader.schema.family("不希望從事"),
             least_popular_job,
             normalize=True,
         )
@@ -283,9 +250,9 @@ class JobProcessor:
             x=0.5, y=4.5, cx=4.5, cy=2.8,
         )
 
-        edu_bg = self.data_reader.get_col_distribution(
+        edu_bg = self.data_reader.col_distribution(
             "父母教育程度", 
-            ["不希望從事", "不希望從事_A", "不希望從事_B"],
+            self.data_reader.schema.family("不希望從事"),
             least_popular_job,
             normalize=True,
         )
@@ -299,11 +266,11 @@ class JobProcessor:
             x=5, y=4, cx=5, cy=3.5,
         )
 
-        cols = ["中文成績", "英文成績", "數學成績"]
+        cols = self.data_reader.schema.group("score")
         grade_data = [
             self.data_reader.get_col_distribution(
                 col, normalize=True, return_dict=True,
-                filter_column=["不希望從事", "不希望從事_A", "不希望從事_B"],
+                filter_column=self.data_reader.schema.family("不希望從事"),
                 filter_value=least_popular_job,
             ) for col in cols
         ]
@@ -321,8 +288,8 @@ class JobProcessor:
 
         self.ppt_generator.create_blank_slide("從事與大學主修科目相關工作的可能性")
 
-        data = self.data_reader.get_col_distribution(
-            "從事相關工作", normalize=True, return_dict=False
+        data = self.data_reader.col_distribution(
+            "從事相關工作", normalize=True
         )
 
         self.ppt_generator.add_donut_chart(
@@ -346,13 +313,13 @@ class JobProcessor:
         )
 
         major_data = self.data_reader.get_combined_distribution(
-            columns=["希望修讀", "希望修讀_A", "希望修讀_B"],
+            columns=self.data_reader.schema.family("希望修讀"),
             filtered_column="從事相關工作",
             filter_value="絕對會"
         ).head(10)
 
         job_data = self.data_reader.get_combined_distribution(
-            columns=["希望從事", "希望從事_A", "希望從事_B"],
+            columns=self.data_reader.schema.family("希望從事"),
             filtered_column="從事相關工作",
             filter_value="絕對不會"
         ).head(10)
@@ -413,7 +380,7 @@ class JobProcessor:
             st.error(f"Failed to process job page 2: {str(e)}")
 
         try:
-            self._process_major_preference_page("受歡迎職業", ["希望從事", "希望從事_A", "希望從事_B"])
+            self._process_major_preference_page("受歡迎職業", self.data_reader.schema.family("希望從事"))
         except Exception as e:
             st.error(f"Failed to process popular jobs page: {str(e)}")
             
@@ -423,12 +390,12 @@ class JobProcessor:
             st.error(f"Failed to create popular jobs trend slide: {str(e)}")
             
         try:
-            self._process_gender_major_preference_page("受男女歡迎職業排名", ["希望從事", "希望從事_A", "希望從事_B"])
+            self._process_gender_major_preference_page("受男女歡迎職業排名", self.data_reader.schema.family("希望從事"))
         except Exception as e:
             st.error(f"Failed to process gender-based popular jobs page: {str(e)}")
         
         try:
-            self._process_major_preference_page("不受歡迎職業", ["不希望從事", "不希望從事_A", "不希望從事_B"])
+            self._process_major_preference_page("不受歡迎職業", self.data_reader.schema.family("不希望從事"))
         except Exception as e:
             st.error(f"Failed to process unpopular jobs page: {str(e)}")
             
@@ -443,7 +410,7 @@ class JobProcessor:
             st.error(f"Failed to process least popular job page: {str(e)}")
 
         try:
-            self._process_gender_major_preference_page("不受男女歡迎職業排名", ["不希望從事", "不希望從事_A", "不希望從事_B"])
+            self._process_gender_major_preference_page("不受男女歡迎職業排名", self.data_reader.schema.family("不希望從事"))
         except Exception as e:
             st.error(f"Failed to process gender-based unpopular jobs page: {str(e)}")
 
@@ -13,9 +13,7 @@ class MajorProcessor:
     def _process_page1(self):
         self.ppt_generator.create_blank_slide("受歡迎主修科目")
 
-        data = self.data_reader.get_combined_distribution(
-            ["希望修讀", "希望修讀_A", "希望修讀_B"],
-        )[:5]
+        data = self.data_reader.get_top_k(self.data_reader.schema.family("希望修讀"), 5)
 
         self.ppt_generator.add_bar_chart(
             data,
@@ -26,8 +24,8 @@ class MajorProcessor:
             x=3.5, cx=6
         )
 
-        major = data["希望修讀"].tolist()
-        distribution = data["distribution"].tolist()
+        major = data.labels.tolist()
+        distribution = data.values.tolist()
         text = (
             f"第一位 {major[0]} {distribution[0]*100:.1f}%\n",
             f"第二位 {major[1]} {distribution[1]*100:.1f}%\n",
@@ -44,17 +42,10 @@ class MajorProcessor:
         self.ppt_generator.create_blank_slide("受歡迎主修科目走勢")
         self.ppt_generator.create_blank_slide("最受男女歡迎主修科目排名")
 
-        male_data = self.data_reader.get_combined_distribution(
-            ["希望修讀", "希望修讀_A", "希望修讀_B"],
-            filtered_column="性別",
-            filter_value="男"
-        )[:5]
-
-        female_data = self.data_reader.get_combined_distribution(
-           ["希望修讀", "希望修讀_A", "希望修讀_B"],
-           filtered_column="性別",
-           filter_value="女"
-       )[:5]
+        gender_data = self.data_reader.get_top_k(
+            self.data_reader.schema.family("希望修讀"), 5, by="性別", groups=self.data_reader.schema.values("性別")
+        )
+        male_data, female_data = gender_data["男"], gender_data["女"]
 
         self.ppt_generator.add_bar_chart(
             male_data,
@@ -96,7 +87,7 @@ class MajorProcessor:
         self.ppt_generator.create_blank_slide("不受歡迎主修科目")
         
         data = self.data_reader.get_combined_distribution(
-            ["不希望修讀", "不希望修讀_A", "不希望修讀_B"],
+            self.data_reader.schema.family("不希望修讀"),
         )[:5]
 
 
@@ -128,14 +119,14 @@ class MajorProcessor:
     def _process_least_popular_major(self):
 
         least_popular_major = self.data_reader.get_combined_distribution(
-            ["不希望修讀", "不希望修讀_A", "不希望修讀_B"],
+            self.data_reader.schema.family("不希望修讀"),
         ).head(1)["不希望修讀"].values[0]
 
         self.ppt_generator.create_blank_slide(f"最不受歡迎主修科目：{least_popular_major} (背景資料)")
 
-        gender = self.data_reader.get_col_distribution(
+        gender = self.data_reader.col_distribution(
             "性別",  
-            ["不希望修讀", "不希望修讀_A", "不希望修讀_B"],
+            self.data_reader.schema.family("不希望修讀"),
             least_popular_major,
             normalize=True, 
         
@@ -149,9 +140,9 @@ class MajorProcessor:
             x=0.0, y=1.7, cx=3, cy=3,
         )
 
-        banding = self.data_reader.get_col_distribution(
+        banding = self.data_reader.col_distribution(
             "Banding", 
-            ["不希望修讀", "不希望修讀_A", "不希望修讀_B"],
+            self.data_reader.schema.family("不希望修讀"),
             least_popular_major,
             normalize=True,
         )
@@ -164,9 +155,9 @@ class MajorProcessor:
             x=2.3, y=1.7, cx=3, cy=3,
         )
 
-        elective = self.data_reader.get_col_distribution(
+        elective = self.data_reader.col_distribution(
             "高中選修學科", 
-            ["不希望修讀", "不希望修讀_A", "不希望修讀_B"],
+            self.data_reader.schema.family("不希望修讀"),
             least_popular_major,
             normalize=True,
         )
@@ -180,9 +171,9 @@ class MajorProcessor:
             x=0.5, y=4.5, cx=4.5, cy=2.8,
         )
 
-        edu_bg = self.data_reader.get_col_distribution(
+        edu_bg = self.data_reader.col_distribution(
             "父母教育程度", 
-            ["不希望修讀", "不希望修讀_A", "不希望修讀_B"],
+            self.data_reader.schema.family("不希望修讀"),
             least_popular_major,
             normalize=True,
         )
@@ -196,11 +187,11 @@ class MajorProcessor:
             x=5, y=4, cx=5, cy=3.5,
         )
 
-        cols = ["中文成績", "英文成績", "數學成績"]
+        cols = self.data_reader.schema.group("score")
         grade_data = [
             self.data_reader.get_col_distribution(
                 col, normalize=True, return_dict=True,
-                filter_column=["不希望修讀", "不希望修讀_A", "不希望修讀_B"],
+                filter_column=self.data_reader.schema.family("不希望修讀"),
                 filter_value=least_popular_major
             ) for col in cols
         ]
@@ -218,17 +209,10 @@ class MajorProcessor:
     def _process_page4(self):
         self.ppt_generator.create_blank_slide("最不受男女歡迎主修科目")
 
-        male_data = self.data_reader.get_combined_distribution(
-            ["不希望修讀", "不希望修讀_A", "不希望修讀_B"],
-            filtered_column="性別",
-            filter_value="男"
-        )[:5]
-
-        female_data = self.data_reader.get_combined_distribution(
-            ["不希望修讀", "不希望修讀_A", "不希望修讀_B"],
-           filtered_column="性別",
-           filter_value="女"
-       )[:5]
+        gender_data = self.data_reader.get_top_k(
+            self.data_reader.schema.family("不希望修讀"), 5, by="性別", groups=self.data_reader.schema.values("性別")
+        )
+        male_data, female_data = gender_data["男"], gender_data["女"]
 
         self.ppt_generator.add_bar_chart(
             male_data,
@@ -14,9 +14,8 @@ class StemProcessor:
     def _process_page1(self):
         self.ppt_generator.create_blank_slide("DSE考生STEM學習項目參與分佈")
 
-        stem_dis = self.data_reader.get_col_distribution("參加STEM", normalize=True, return_dict=False)
+        stem_dis = self.data_reader.col_distribution("參加STEM", normalize=True)
         current_year = str(datetime.now().year)
-        stem_dis = stem_dis.rename(columns={"distribution": current_year})
         
         self.ppt_generator.add_donut_chart(
             stem_dis,
@@ -28,6 +27,7 @@ class StemProcessor:
             x=5.5, y=2, cx=4, cy=4
         )
 
+        stem_dis = stem_dis.to_frame("參加STEM", current_year)
         stem_dis[current_year] = stem_dis[current_year].apply(lambda x: f"{x:.1%}")
 
         self.ppt_generator.add_table(
@@ -113,8 +113,8 @@ class StemProcessor:
 
     def _process_page2(self):
         self.ppt_generator.create_blank_slide("STEM學習項目影響程度")
-        data = self.data_reader.get_col_distribution(
-            "STEM影響職業選擇程度", normalize=True, return_dict=False, exclude=0,
+        data = self.data_reader.col_distribution(
+            "STEM影響職業選擇程度", normalize=True, exclude=0,
         )
         self.ppt_generator.add_donut_chart(
             data, "STEM影響職業選擇程度", "distribution",
@@ -125,7 +125,7 @@ class StemProcessor:
             x=0.1, y=2, cx=4, cy=4
         )
 
-        cols = ["領導能力", "團隊合作", "創新思維", "科學知識", "解難能力"]
+        cols = self.data_reader.schema.group("stem_skill")
 
         data = [
             self.data_reader.get_col_distribution(
@@ -168,21 +168,21 @@ class StemProcessor:
             st.error(f"Failed to process STEM page 2: {str(e)}")
             
         try:
-            self._process_major_or_job_page("STEM參與率不同下受歡迎主修科目分佈", ["希望修讀", "希望修讀_A", "希望修讀_B"], ["電腦工程", "電腦科學"])
+            self._process_major_or_job_page("STEM參與率不同下受歡迎主修科目分佈", self.data_reader.schema.family("希望修讀"), ["電腦工程", "電腦科學"])
         except Exception as e:
             st.error(f"Failed to process STEM popular majors page: {str(e)}")
             
         try:
-            self._process_major_or_job_page("STEM參與率不同下不受歡迎主修科目分佈", ["不希望修讀", "不希望修讀_A", "不希望修讀_B"], ["數學"])
+            self._process_major_or_job_page("STEM參與率不同下不受歡迎主修科目分佈", self.data_reader.schema.family("不希望修讀"), ["數學"])
         except Exception as e:
             st.error(f"Failed to process STEM unpopular majors page: {str(e)}")
             
         try:
-            self._process_major_or_job_page("STEM參與率不同下受歡迎職業分佈", ["希望從事", "希望從事_A", "希望從事_B"], ["資訊科技", "電腦工程"])
+            self._process_major_or_job_page("STEM參與率不同下受歡迎職業分佈", self.data_reader.schema.family("希望從事"), ["資訊科技", "電腦工程"])
         except Exception as e:
             st.error(f"Failed to process STEM popular jobs page: {str(e)}")
             
         try:
-            self._process_major_or_job_page("STEM參與率不同下不受歡迎職業分佈", ["不希望從事", "不希望從事_A", "不希望從事_B"], ["電腦工程"])
+            self._process_major_or_job_page("STEM參與率不同下不受歡迎職業分佈", self.data_reader.schema.family("不希望從事"), ["電腦工程"])
         except Exception as e:
             st.error(f"Failed to process STEM unpopular jobs page: {str(e)}")
@@ -0,0 +1,39 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+
+
+class QueryCache:
+    """Bounded LRU cache of query results that can be invalidated per column"""
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[object, frozenset]] = OrderedDict()
+
+    def get_or_compute(self, key: Hashable, columns: Iterable[str], compute: Callable[[], object]) -> object:
+        """Return the cached result for key, computing and storing it on a miss"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+        self.misses += 1
+        result = compute()
+        if self.maxsize > 0:
+            self._entries[key] = (result, frozenset(columns))
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+
+    def invalidate(self, columns: Iterable[str]) -> None:
+        """Drop every cached result that read any of the given columns"""
+        columns = set(columns)
+        stale = [key for key, (_, used) in self._entries.items() if used & columns]
+        for key in stale:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def info(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
@@ -2,35 +2,112 @@ import streamlit as st
 import pandas as pd
 import tempfile
 import os
+import hashlib
+from concurrent.futures import Future, ThreadPoolExecutor
 from io import BytesIO
 from dataclasses import dataclass
 import traceback
 
 # Import your existing modules
 from presentation_generator import Config, PresentationGenerator
+from data_validator import DataValidator
+from validation_result import ValidationPreview, ValidationResult
 
-def display_validation_errors(validation_results: list[dict]) -> None:
+# Rows checked by the preview and how long it may read the workbook, in seconds
+PREVIEW_SAMPLE_SIZE = 1000
+PREVIEW_TIME_BUDGET = 2.0
+
+
+@st.cache_resource
+def get_executor() -> ThreadPoolExecutor:
+    """Worker pool shared across reruns and sessions for full validations"""
+    return ThreadPoolExecutor(max_workers=2)
+
+
+def run_full_validation(config: Config) -> tuple[list[str], list[ValidationResult], pd.DataFrame]:
+    """Load the whole workbook, validate and profile it; runs in a background worker"""
+    presentation_generator = PresentationGenerator(config)
+    return (
+        presentation_generator.validate_columns(),
+        presentation_generator.validate_values(),
+        presentation_generator.profile_data(),
+    )
+
+
+def start_validation(uploaded_file) -> None:
+    """Preview an uploaded file on a row sample and start its full validation in the background"""
+    data = uploaded_file.getvalue()
+    upload_key = hashlib.sha256(data).hexdigest()
+    if st.session_state.get("upload_key") == upload_key:
+        return
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
+        tmp_file.write(data)
+        temp_file_path = tmp_file.name
+    config = Config(data_file=temp_file_path)
+
+    st.session_state.upload_key = upload_key
+    st.session_state.config = config
+    st.session_state.full_validation = get_executor().submit(run_full_validation, config)
+    with st.spinner("Checking a sample of the data..."):
+        try:
+            st.session_state.preview = DataValidator.preview(
+                temp_file_path, PREVIEW_SAMPLE_SIZE, PREVIEW_TIME_BUDGET
+            )
+        except Exception:
+            # The full validation reports unreadable files
+            st.session_state.preview = None
+
+
+def display_missing_columns(missing_columns: list[str]) -> None:
+    st.error("❌ Missing Required Columns")
+    st.write("The following columns are missing from your Excel file:")
+    for col in missing_columns:
+        st.write(f"• {col}")
+
+
+def display_preview(preview: ValidationPreview | None) -> None:
+    """Show the provisional results of the sample check"""
+    if preview is None:
+        st.info("⏳ Validating data...")
+        return
+    if preview.complete:
+        scope = f"all {preview.rows_scanned} rows"
+    else:
+        total = f"about {preview.rows_expected}" if preview.rows_expected else "an unknown number of"
+        scope = f"{preview.sample_rows} sampled rows (first {preview.rows_scanned} of {total} rows scanned)"
+    st.info(f"⏳ Provisional results from {scope}. Full validation is still running...")
+
+    if preview.missing_columns:
+        display_missing_columns(preview.missing_columns)
+    elif any(preview.value_results):
+        display_validation_errors(preview.value_results)
+    else:
+        st.success("No issues found in the sample so far.")
+
+
+@st.fragment(run_every=1.0)
+def wait_for_full_validation(full_validation: Future) -> None:
+    """Poll the background validation and rerun the page once it is done"""
+    if full_validation.done():
+        st.rerun()
+    st.caption("Waiting for full validation to finish...")
+
+def display_validation_errors(validation_results: list[ValidationResult]) -> None:
     st.error("❌ Invalid Data Found")
     try:
-        for result_dict in validation_results:
-            if not result_dict:  # If the dictionary is not empty
+        for result in validation_results:
+            if not result:  # Skip rules without invalid cells
                 continue
             
-            for column, invalid_entries in result_dict.items():
-                if column == "acceptable_values":
-                    continue
-
+            for column, violations in result.items():
                 st.write(f"**Column: {column}**")
 
-                display_entries = invalid_entries[:5]
+                # Only the rows that are shown get materialized
+                error_df = violations.to_frame(limit=5)
                 
-                if display_entries:
-                    error_df = pd.DataFrame([
-                        {"Row Index": row_id, "Invalid Value": str(value)} 
-                        for row_id, value in display_entries
-                    ])
-
-                    st.write("**Acceptable Values:**", ", ".join(map(str, result_dict.get("acceptable_values", []))))
+                if not error_df.empty:
+                    st.write("**Acceptable Values:**", ", ".join(map(str, result.acceptable_values)))
 
                     st.dataframe(
                         error_df, 
@@ -39,8 +116,8 @@ def display_validation_errors(validation_results: list[dict]) -> None:
                     )
                     
                     # Show count of remaining errors if any
-                    if len(invalid_entries) > 5:
-                        remaining = len(invalid_entries) - 5
+                    if len(violations) > 5:
+                        remaining = len(violations) - 5
                         st.info(f"... and {remaining} more invalid entries in this column")
                 
                 st.write("---")
@@ -88,30 +165,38 @@ def main():
 
     
     if uploaded_file is not None:
-        # Create temporary file for the uploaded data
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
-            temp_file_path = tmp_file.name
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pptx') as tmp_output:
-            output_path = tmp_output.name
-
-        config = Config(data_file=temp_file_path, output_path=output_path)
-        presentation_generator = PresentationGenerator(config)
-
-        # data validation
-        with st.spinner("Validating data..."):
-            validation_columns_results = presentation_generator.validate_columns()
-            if validation_columns_results:
-                st.error("❌ Missing Required Columns")
-                st.write("The following columns are missing from your Excel file:")
-                for col in validation_columns_results:
-                    st.write(f"• {col}")
-                return
-
-            validation_values_results = presentation_generator.validate_values()
-
-        all_valid = all(not result for result in validation_values_results if result)
+        start_validation(uploaded_file)
+        config = st.session_state.config
+        full_validation = st.session_state.full_validation
+
+        # Show the sample results until the full validation is done; generation waits for it
+        if not full_validation.done():
+            display_preview(st.session_state.preview)
+            st.button("📊 Generate PowerPoint", type="primary", disabled=True)
+            wait_for_full_validation(full_validation)
+            return
+
+        try:
+            validation_columns_results, validation_values_results, profile = full_validation.result()
+        except Exception:
+            st.error("An error occurred while validating the data.")
+            st.write(traceback.format_exc())
+            return
+
+        # The profile was computed while loading, so showing it costs no extra pass
+        with st.expander("📋 Data profile"):
+            st.dataframe(
+                profile,
+                use_container_width=True,
+                hide_index=True,
+                column_config={"null_rate": st.column_config.NumberColumn(format="percent")},
+            )
+
+        if validation_columns_results:
+            display_missing_columns(validation_columns_results)
+            return
+
+        all_valid = not any(validation_values_results)
         if all_valid:
             st.success("✅ Data validation passed! No issues found.")
         else:
@@ -120,8 +205,15 @@ def main():
 
         # ppt generation
         if st.button("📊 Generate PowerPoint", type="primary"):
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.pptx') as tmp_output:
+                output_path = tmp_output.name
+            # A fresh generator per run; the data loads from the cache written by the full validation
+            presentation_generator = PresentationGenerator(
+                Config(data_file=config.data_file, output_path=output_path)
+            )
             if not all_valid:
-                presentation_generator.replace_invalid_values(validation_values_results)
+                replaced = presentation_generator.replace_invalid_values(presentation_generator.validate_values())
+                st.info(f"Replaced {sum(replaced.values())} invalid values with NA.")
             
             # Generate presentation with progress updates
             with st.spinner("Generating PowerPoint..."):
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import yaml
+
+from data_cache import CACHE_ROOT
+
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "survey_schema.yaml")
+SCHEMA_CACHE_DIR = os.path.join(CACHE_ROOT, "schema")
+# Bump when compile_schema() changes so cached compiled schemas are rebuilt
+COMPILER_VERSION = 3
+
+
+class SurveySchema:
+    """Compiled survey schema: lookup tables for the columns, groups, families and value rules"""
+    def __init__(self, compiled: dict):
+        self.digest: str = compiled["digest"]
+        self.sentinel = compiled["sentinel"]
+        self.required_columns = frozenset(compiled["required_columns"])
+        # Columns with a declared or shared vocabulary, always stored as categoricals
+        self.categorical_columns = frozenset(compiled["categorical_columns"])
+        # (columns, acceptable values), one rule per declared column or group with values
+        self.value_rules: list[tuple[str | list[str], list]] = [
+            (column, values) for column, values in compiled["value_rules"]
+        ]
+        self.groups: dict[str, list[str]] = compiled["groups"]
+        self.families: dict[str, list[str]] = compiled["families"]
+        # Columns the count cube breaks every target down by
+        self.cube_dimensions: list[str] = compiled["cube_dimensions"]
+        self._items: dict[str, list[str]] = compiled["items"]
+        self._values: dict[str, list] = compiled["values"]
+        self._labels: dict[str, dict] = compiled["labels"]
+
+    def group(self, name: str) -> list[str]:
+        """Return the columns of a group"""
+        return list(self.groups[name])
+
+    def group_items(self, name: str) -> list[str]:
+        """Return the item names of a group, which are its columns without the suffix"""
+        return list(self._items[name])
+
+    def family(self, name: str) -> list[str]:
+        """Return the columns of an answer family: the column plus its _A and _B variants"""
+        return list(self.families[name])
+
+    def values(self, column: str) -> list:
+        """Return the acceptable answers of a column, in declared order"""
+        return list(self._values[column])
+
+    def labels(self, column: str) -> dict:
+        """Return the slide label -> answer mapping of a column"""
+        return dict(self._labels[column])
+
+
+def compile_schema(raw: dict, digest: str) -> dict:
+    """Resolve the YAML schema into flat, JSON-serialisable lookup tables"""
+    required = []
+    # Rule name (the column or group) -> (columns, acceptable values)
+    rules = {}
+    values = {}
+    labels = {}
+    groups = {}
+    items = {}
+
+    for column, spec in (raw.get("columns") or {}).items():
+        spec = spec or {}
+        required.append(column)
+        if "values" in spec:
+            values[column] = spec["values"]
+            rules[column] = (column, spec["values"])
+        if "labels" in spec:
+            labels[column] = spec["labels"]
+
+    for name, spec in (raw.get("groups") or {}).items():
+        if "columns" in spec:
+            columns = list(spec["columns"])
+            items[name] = columns
+        elif "items" in spec:
+            columns = [f"{item}{spec.get('suffix', '')}" for item in spec["items"]]
+            items[name] = list(spec["items"])
+        else:
+            raise ValueError(f"Schema group {name} needs either columns or items.")
+        groups[name] = columns
+        required.extend(columns)
+        if "values" in spec:
+            for column in columns:
+                values[column] = spec["values"]
+            rules[name] = (columns, spec["values"])
+
+    families = {name: [name, f"{name}_A", f"{name}_B"] for name in raw.get("families") or []}
+    for columns in families.values():
+        required.extend(columns)
+
+    duplicates = sorted({column for column in required if required.count(column) > 1})
+    if duplicates:
+        raise ValueError(f"Schema declares columns more than once: {', '.join(duplicates)}")
+
+    # Rules are checked in the listed order, then any unlisted ones in declaration order
+    rule_order = list(raw.get("rules") or [])
+    unknown = [name for name in rule_order if name not in rules]
+    if unknown:
+        raise ValueError(f"Schema rules lists columns or groups without values: {', '.join(unknown)}")
+    rule_order.extend(name for name in rules if name not in rule_order)
+    value_rules = [rules[name] for name in rule_order]
+
+    cube_dimensions = []
+    for name in raw.get("cube") or []:
+        cube_dimensions.extend(groups[name] if name in groups else [name])
+    unknown = [column for column in cube_dimensions if column not in required]
+    if unknown:
+        raise ValueError(f"Schema cube uses undeclared columns: {', '.join(unknown)}")
+
+    categorical = list(values)
+    categorical.extend(column for columns in groups.values() for column in columns if column not in values)
+    categorical.extend(column for columns in families.values() for column in columns)
+
+    return {
+        "digest": digest,
+        "sentinel": raw.get("sentinel", 999),
+        "required_columns": required,
+        "categorical_columns": categorical,
+        "value_rules": value_rules,
+        "groups": groups,
+        "families": families,
+        "cube_dimensions": cube_dimensions,
+        "items": items,
+        "values": values,
+        "labels": labels,
+    }
+
+
+def load_schema(path: str = SCHEMA_FILE, cache_dir: str | None = SCHEMA_CACHE_DIR) -> SurveySchema:
+    """Load the schema at path, reusing the compiled form cached under the file's hash"""
+    with open(path, "rb") as f:
+        content = f.read()
+    digest = hashlib.sha256(content + f"\0{COMPILER_VERSION}".encode()).hexdigest()
+
+    cache_file = os.path.join(cache_dir, f"{digest}.json") if cache_dir else None
+    if cache_file is not None:
+        try:
+            with open(cache_file, encoding="utf-8") as f:
+                return SurveySchema(json.load(f))
+        except (OSError, ValueError, KeyError):
+            pass
+
+    compiled = compile_schema(yaml.safe_load(content) or {}, digest)
+    if cache_file is not None:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_file = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(compiled, f, ensure_ascii=False)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            print(f"Failed to write schema cache: {e}")
+    return SurveySchema(compiled)
+
+
+SCHEMA = load_schema()
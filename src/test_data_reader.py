@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_reader import DataReader
+from survey_schema import SCHEMA
+from test import generate_sample_data
+
+UNIVERSITIES = ["浸會大學", "中文大學", "城市大學"]
+
+
+@pytest.fixture(scope="module")
+def sample_file(tmp_path_factory):
+    data = generate_sample_data(300)
+    # Text answers in a binary column and values outside the Banding rule
+    data["浸會大學"] = data["浸會大學"].astype(object)
+    data.loc[[3, 7, 11], "浸會大學"] = "不適用"
+    data.loc[[5, 9], "Banding"] = "Band 9"
+    path = tmp_path_factory.mktemp("data") / "sample.xlsx"
+    data.to_excel(path, index=False)
+    return path
+
+
+@pytest.fixture(scope="module")
+def raw_data(sample_file):
+    # The frame the original pandas implementation worked on
+    return pd.read_excel(sample_file).replace([999, "999"], np.nan)
+
+
+@pytest.fixture(scope="module")
+def row_reader(sample_file):
+    return DataReader(str(sample_file))
+
+
+@pytest.fixture(scope="module")
+def cube_reader(sample_file):
+    return DataReader(str(sample_file), count_cube=True)
+
+
+def combined_reference(data: pd.DataFrame, columns: list[str]) -> dict:
+    """value_counts of each column merged column by column, largest share first"""
+    result = {}
+    for col in columns:
+        for key, value in data[col].value_counts().to_dict().items():
+            result[key] = result.get(key, 0) + value
+    return dict(sorted(((k, v / len(data)) for k, v in result.items()), key=lambda item: item[1], reverse=True))
+
+
+@pytest.mark.parametrize("by", ["性別", "工作地方", "Banding"])
+def test_cube_matches_row_scan(row_reader, cube_reader, raw_data, by):
+    family = SCHEMA.family("希望修讀")
+    for group in raw_data[by].dropna().unique().tolist():
+        filtered = raw_data[raw_data[by] == group]
+        for column in ["高中選修學科", "大灣區了解"]:
+            expected = filtered[column].dropna().value_counts(normalize=True).to_dict()
+            for reader in (row_reader, cube_reader):
+                result = reader.get_col_distribution(column, filter_column=by, filter_value=group, return_dict=True)
+                # Same shares and the same order, ties included
+                assert list(result) == list(expected)
+                assert np.allclose(list(result.values()), list(expected.values()))
+
+        expected = combined_reference(filtered, family)
+        for reader in (row_reader, cube_reader):
+            result = reader.get_combined_distribution(family, filtered_column=by, filter_value=group, return_dict=True)
+            assert list(result) == list(expected)
+            assert np.allclose(list(result.values()), list(expected.values()))
+
+    for target in ["高中選修學科", family]:
+        pd.testing.assert_frame_equal(
+            row_reader.get_distribution_matrix(target, by=by), cube_reader.get_distribution_matrix(target, by=by)
+        )
+        row_top = row_reader.get_top_k(target, None, by=by)
+        cube_top = cube_reader.get_top_k(target, None, by=by)
+        assert row_top.keys() == cube_top.keys()
+        for group, result in row_top.items():
+            assert result.labels.tolist() == cube_top[group].labels.tolist()
+            assert np.allclose(result.values, cube_top[group].values)
+
+
+def test_top_k_orders_groups_like_filtered_distributions(row_reader):
+    family = SCHEMA.family("希望修讀")
+    for group, result in row_reader.get_top_k(family, 5, by="工作地方").items():
+        expected = row_reader.get_combined_distribution(family, filtered_column="工作地方", filter_value=group)
+        assert result.labels.tolist() == expected.iloc[:5, 0].tolist()
+
+
+def test_replace_invalid_values_is_idempotent(sample_file):
+    reader = DataReader(str(sample_file), value_rules=SCHEMA.value_rules)
+    results = reader.value_results
+    before = {column: violations.entries() for result in results for column, violations in result.items()}
+    assert [row for row, _ in before["Banding"]] == [5, 9]
+
+    counts = reader.replace_invalid_values(results)
+    assert counts["Banding"] == 2
+    assert reader.data.loc[[5, 9], "Banding"].isna().all()
+    # The caller's results are left as they were; the reader's own results are checked again
+    assert {column: violations.entries() for result in results for column, violations in result.items()} == before
+    assert not any(column == "Banding" for result in reader.value_results for column, _ in result.items())
+
+    data = reader.data.copy()
+    assert not any(reader.replace_invalid_values(results).values())
+    pd.testing.assert_frame_equal(reader.data, data)
+
+
+@pytest.mark.parametrize("value", [0, 1])
+def test_binary_distribution_counts_text_as_zero(row_reader, raw_data, value):
+    # Text answers do not match 1 but count as 0, as the original pd.to_numeric(...).fillna(0) did
+    data = raw_data.dropna(subset=UNIVERSITIES)
+    expected = {
+        col: int((pd.to_numeric(data[col], errors="coerce").fillna(0) == value).sum()) / len(data)
+        for col in UNIVERSITIES
+    }
+    result = row_reader.get_binary_distribution(UNIVERSITIES, value=value)
+    assert list(result) == UNIVERSITIES
+    assert np.allclose([result[col] for col in UNIVERSITIES], [expected[col] for col in UNIVERSITIES])
+    if value == 0:
+        assert result["浸會大學"] >= 3 / len(data)
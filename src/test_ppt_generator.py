@@ -0,0 +1,60 @@
+import pandas as pd
+from pptx.util import Inches
+
+from ppt_generator import PptGenerator
+
+
+def make_table(n_rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"category": [f"item {i}" for i in range(n_rows)], "share": range(n_rows)})
+
+
+def tables(generator: PptGenerator) -> list:
+    return [shape for slide in generator.prs.slides for shape in slide.shapes if shape.has_table]
+
+
+def test_table_at_max_rows_stays_on_one_slide():
+    generator = PptGenerator()
+    generator.create_blank_slide("Table")
+    generator.add_table(make_table(10), index=False, y=1.5, cy=3.5, max_rows_per_slide=10)
+
+    assert len(generator.prs.slides) == 1
+    (shape,) = tables(generator)
+    assert len(shape.table.rows) == 11
+    assert shape.height == Inches(3.5)
+
+
+def test_table_past_max_rows_continues_with_header():
+    generator = PptGenerator()
+    generator.create_blank_slide("Table")
+    generator.add_table(make_table(11), index=False, y=1.5, cy=3.5, max_rows_per_slide=10)
+
+    assert len(generator.prs.slides) == 2
+    first, second = tables(generator)
+    assert [len(shape.table.rows) for shape in (first, second)] == [11, 2]
+    assert generator.prs.slides[1].shapes.title.text == "Table"
+    assert second.table.cell(0, 0).text == "category"
+    assert second.table.cell(1, 0).text == "item 10"
+    for shape in (first, second):
+        assert shape.top + shape.height <= generator.prs.slide_height - Inches(0.6)
+
+
+def test_table_rows_stop_above_the_footer():
+    generator = PptGenerator()
+    generator.create_blank_slide("Table")
+    # A tall box starting low on the slide fits fewer rows than max_rows_per_slide
+    generator.add_table(make_table(20), index=False, y=5, cy=5, max_rows_per_slide=10)
+
+    assert sum(len(shape.table.rows) - 1 for shape in tables(generator)) == 20
+    for shape in tables(generator):
+        assert shape.top + shape.height <= generator.prs.slide_height - Inches(0.6)
+
+
+def test_table_without_max_rows_is_not_split():
+    generator = PptGenerator()
+    generator.create_blank_slide("Table")
+    generator.add_table(make_table(30), index=False, cy=3.5)
+
+    assert len(generator.prs.slides) == 1
+    (shape,) = tables(generator)
+    assert len(shape.table.rows) == 31
+    assert shape.height == Inches(3.5)
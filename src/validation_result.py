@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+
+class ColumnViolations:
+    """Invalid cells of one column: row positions plus codes into the column's distinct invalid values"""
+    def __init__(self, column: str, positions: np.ndarray, codes: np.ndarray, values: np.ndarray, index: pd.Index):
+        self.column = column
+        self.positions = positions
+        self.codes = codes
+        self.values = values
+        self.index = index
+
+    @staticmethod
+    def invalid_lookup(vocabulary: pd.Index, acceptable_values: list) -> np.ndarray:
+        """Return a code -> invalid lookup over vocabulary, with a trailing slot for NaN (-1), which is acceptable"""
+        return np.append(~vocabulary.isin(acceptable_values), False)
+
+    @classmethod
+    def from_codes(
+        cls, column: str, codes: np.ndarray, vocabulary: pd.Index, invalid: np.ndarray, index: pd.Index
+    ) -> "ColumnViolations | None":
+        """Find the cells of a dictionary-encoded column whose code is marked in the invalid lookup"""
+        positions = np.flatnonzero(invalid[codes])
+        if not len(positions):
+            return None
+        invalid_codes, invalid_values = pd.factorize(codes[positions])
+        return cls(
+            column, positions, invalid_codes.astype(np.int32),
+            vocabulary.take(invalid_values).to_numpy(dtype=object), index,
+        )
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def mask(self) -> np.ndarray:
+        """Return a boolean row mask of the invalid cells"""
+        mask = np.zeros(len(self.index), dtype=bool)
+        mask[self.positions] = True
+        return mask
+
+    def entries(self, limit: int | None = None) -> list[tuple]:
+        """Return (row_id, value) tuples for the first limit invalid cells"""
+        row_ids = self.index[self.positions[:limit]].tolist()
+        return list(zip(row_ids, self.values[self.codes[:limit]].tolist()))
+
+    def to_frame(self, limit: int | None = None) -> pd.DataFrame:
+        """Return the first limit invalid cells as a (Row Index, Invalid Value) frame"""
+        return pd.DataFrame({
+            "Row Index": self.index[self.positions[:limit]],
+            "Invalid Value": [str(value) for value in self.values[self.codes[:limit]]],
+        })
+
+    def value_counts(self) -> pd.Series:
+        """Return how often each distinct invalid value occurs"""
+        return pd.Series(np.bincount(self.codes, minlength=len(self.values)), index=pd.Index(self.values, dtype=object))
+
+
+class ValidationResult:
+    """Outcome of one value rule: the acceptable values and the invalid cells of each column"""
+    def __init__(self, acceptable_values: list, columns: dict[str, ColumnViolations]):
+        self.acceptable_values = acceptable_values
+        self.columns = columns
+
+    def __bool__(self) -> bool:
+        return any(len(violations) for violations in self.columns.values())
+
+    def __len__(self) -> int:
+        """Return the number of invalid cells across all columns"""
+        return sum(len(violations) for violations in self.columns.values())
+
+    def items(self):
+        return self.columns.items()
+
+
+class ValidationPreview:
+    """Provisional validation of a row sample, shown while the full validation is still running"""
+    def __init__(
+        self,
+        missing_columns: list[str],
+        value_results: list[ValidationResult],
+        sample_rows: int,
+        rows_scanned: int,
+        rows_expected: int | None,
+    ):
+        self.missing_columns = missing_columns
+        self.value_results = value_results
+        self.sample_rows = sample_rows
+        self.rows_scanned = rows_scanned
+        # Row count stored in the workbook, None if it does not record one
+        self.rows_expected = rows_expected
+
+    @property
+    def complete(self) -> bool:
+        """Whether the whole sheet was scanned within the time budget"""
+        return self.rows_expected is not None and self.rows_scanned >= self.rows_expected
@@ -0,0 +1,168 @@
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from openpyxl.cell.cell import ERROR_CODES
+from pandas.io.parsers import TextParser
+
+# Stand-in key for NaN, which never equals itself as a dict key
+_NAN = object()
+
+
+class WorkbookReader:
+    """Read-only reader for the first worksheet of an Excel workbook"""
+    def __init__(
+        self,
+        file_path: str,
+        columns: frozenset[str] | None = None,
+        chunk_size: int = 10_000,
+        on_progress: Callable[[int, int | None], None] | None = None,
+    ):
+        self.file_path = file_path
+        self.columns = columns
+        self.chunk_size = chunk_size
+        # Called after every chunk with (rows read, expected rows or None)
+        self.on_progress = on_progress
+
+    def read_frame(self) -> pd.DataFrame:
+        """Read the projected columns into a DataFrame, converting cells the way pd.read_excel does"""
+        data = []
+        with self._open() as (header, positions, rows, _):
+            data.append([header[i] for i in positions])
+            last_row_with_data = 0
+            for row in rows:
+                data.append([_excel_value(row[i]) for i in positions])
+                # Trailing empty rows are dropped; data outside the projection still counts
+                if any(v is not None for v in row):
+                    last_row_with_data = len(data) - 1
+
+        del data[last_row_with_data + 1:]
+        return TextParser(data, header=0).read()
+
+    def read_sample(self, sample_size: int, time_budget: float, seed: int = 0) -> tuple[pd.DataFrame, int, int | None]:
+        """
+        Read a stratified sample of about sample_size rows: the sheet is cut into equal strata and one
+        random row is kept from each. Reading stops once time_budget seconds have passed.
+        Returns the sample indexed by data row position, the rows scanned and the expected row count.
+        """
+        deadline = time.perf_counter() + time_budget
+        with self._open() as (header, positions, rows, expected):
+            data = [[header[i] for i in positions]]
+            index = []
+            stride = -(-expected // sample_size) if expected and sample_size else 1
+            offsets = np.random.default_rng(seed).integers(0, stride, size=-(-(expected or 0) // stride) + 1)
+            scanned = 0
+            for row in rows:
+                stratum, offset = divmod(scanned, stride)
+                scanned += 1
+                # Rows past the expected count all fall into the last stratum's draw
+                if offset == offsets[min(stratum, len(offsets) - 1)] and any(v is not None for v in row):
+                    data.append([_excel_value(row[i]) for i in positions])
+                    index.append(scanned - 1)
+                if (not expected and len(index) >= sample_size) or time.perf_counter() > deadline:
+                    break
+
+        sample = TextParser(data, header=0).read()
+        sample.index = pd.Index(index, dtype=np.int64)
+        return sample, scanned, expected
+
+    def read_encoded(self) -> tuple[list, list[tuple[np.ndarray, list]]]:
+        """
+        Stream the projected columns chunk by chunk into dictionary-encoded buffers.
+        Returns the column names and, per column, the int32 cell codes and the distinct
+        cell values (converted like pd.read_excel, before type inference).
+        """
+        with self._open() as (header, positions, rows, expected):
+            names = TextParser([[_excel_value(header[i]) for i in positions]], header=0).read().columns.tolist()
+            capacity = expected if expected else self.chunk_size
+            codes = np.empty((len(positions), capacity), dtype=np.int32)
+            lookups = [{} for _ in positions]
+            uniques = [[] for _ in positions]
+
+            n_rows = 0
+            last_row_with_data = -1
+            for chunk in _chunks(rows, self.chunk_size):
+                if n_rows + len(chunk) > capacity:
+                    capacity = max(capacity * 2, n_rows + len(chunk))
+                    grown = np.empty((len(positions), capacity), dtype=np.int32)
+                    grown[:, :n_rows] = codes[:, :n_rows]
+                    codes = grown
+
+                for j, pos in enumerate(positions):
+                    codes[j, n_rows:n_rows + len(chunk)] = _encode_chunk(
+                        [row[pos] for row in chunk], lookups[j], uniques[j]
+                    )
+                for i, row in enumerate(chunk):
+                    if any(v is not None for v in row):
+                        last_row_with_data = n_rows + i
+
+                n_rows += len(chunk)
+                if self.on_progress is not None:
+                    self.on_progress(n_rows, expected)
+
+        n_rows = last_row_with_data + 1
+        columns = [(codes[j, :n_rows].copy(), uniques[j]) for j in range(len(positions))]
+        if len(columns) == 1:
+            # A single-column sheet loses its blank lines in pd.read_excel
+            column_codes, values = columns[0]
+            blank = np.array([v == "" or isinstance(v, str) and not v.strip() for v in values] + [False])
+            columns = [(column_codes[~blank[column_codes]], values)]
+        return names, columns
+
+    @contextmanager
+    def _open(self) -> Iterator[tuple[tuple, list[int], Iterator[tuple], int | None]]:
+        """Yield the header, projected positions, padded data rows and expected row count of the first sheet"""
+        workbook = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            # The stored dimension is only a hint for preallocation; rows are read until the sheet ends
+            expected = sheet.max_row - 1 if sheet.max_row else None
+            sheet.reset_dimensions()
+
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, ())
+            positions = [i for i, name in enumerate(header) if self.columns is None or name in self.columns]
+            width = len(header)
+            padded = (row if len(row) >= width else row + (None,) * (width - len(row)) for row in rows)
+            yield header, positions, padded, expected
+        finally:
+            workbook.close()
+
+
+def _chunks(rows: Iterator[tuple], size: int) -> Iterator[list[tuple]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _encode_chunk(values: list, lookup: dict, uniques: list) -> np.ndarray:
+    """Return the codes of one chunk of raw cells, adding unseen values to lookup and uniques"""
+    chunk_codes, chunk_uniques = pd.factorize(np.array(values, dtype=object), use_na_sentinel=False)
+    remap = np.empty(len(chunk_uniques), dtype=np.int32)
+    for i, raw in enumerate(chunk_uniques):
+        value = _excel_value(None if pd.isna(raw) else raw)
+        key = _NAN if value is np.nan else value
+        if key not in lookup:
+            lookup[key] = len(uniques)
+            uniques.append(value)
+        remap[i] = lookup[key]
+    return remap[chunk_codes]
+
+
+def _excel_value(value):
+    """Convert a read-only openpyxl cell value like pandas' openpyxl reader"""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, str) and value in ERROR_CODES:
+        return np.nan
+    return value